@@ -1,6 +1,8 @@
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Protocol, Set, Union
+from typing import FrozenSet, Iterable, Optional, Protocol, Union
 
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from syft_core import Client
 from syft_core.exceptions import SyftBoxException
@@ -15,6 +17,14 @@ class SyftClientProtocol(Protocol):
     def to_syft_url(self, file_path: Path) -> str: ...
 
 
+@dataclass(frozen=True)
+class StoragePaths:
+    """Directories holding uploaded file contents and their JSON metadata."""
+
+    storage: Path
+    metadata: Path
+
+
 class Settings(BaseSettings):
     # Environment configuration
     APP_ENV: str = "production"  # production, development, testing
@@ -22,43 +32,57 @@ class Settings(BaseSettings):
     # File storage configuration
     FILE_STORAGE_PATH: str = "./files"
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB default
+    FSYNC_ON_WRITE: bool = False  # opt in to fsyncing stored files
+    FILE_HASH_ALGORITHM: str = "blake2b"  # content identity, not security
 
     # Syft core integration
     SYFT_USER_EMAIL: Optional[str] = None
+    # Root of the mock SyftBox used outside production
+    MOCK_SYFTBOX_PATH: str = "/tmp/syftbox_mock"
 
     # Allowed file types
-    ALLOWED_EXTENSIONS: Set[str] = {
-        ".jpg",
-        ".jpeg",
-        ".png",
-        ".gif",
-        ".pdf",
-        ".txt",
-        ".doc",
-        ".docx",
-        ".csv",
-        ".xlsx",
-        ".xls",
-        ".json",
-    }
-
-    ALLOWED_MIME_TYPES: Set[str] = {
-        # Images
-        "image/jpeg",
-        "image/png",
-        "image/gif",
-        # Documents
-        "application/pdf",
-        "text/plain",
-        "application/msword",
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        # Spreadsheets
-        "text/csv",
-        "application/vnd.ms-excel",
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        # Data files
-        "application/json",
-    }
+    ALLOWED_EXTENSIONS: FrozenSet[str] = frozenset(
+        {
+            ".jpg",
+            ".jpeg",
+            ".png",
+            ".gif",
+            ".pdf",
+            ".txt",
+            ".doc",
+            ".docx",
+            ".csv",
+            ".xlsx",
+            ".xls",
+            ".json",
+        }
+    )
+
+    ALLOWED_MIME_TYPES: FrozenSet[str] = frozenset(
+        {
+            # Images
+            "image/jpeg",
+            "image/png",
+            "image/gif",
+            # Documents
+            "application/pdf",
+            "text/plain",
+            "application/msword",
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            # Spreadsheets
+            "text/csv",
+            "application/vnd.ms-excel",
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            # Data files
+            "application/json",
+        }
+    )
+
+    @field_validator("ALLOWED_EXTENSIONS", "ALLOWED_MIME_TYPES")
+    @classmethod
+    def lowercase_allowed(cls, values: Iterable[str]) -> FrozenSet[str]:
+        """Store allowed types lowercased so lookups need no normalization."""
+        return frozenset(value.lower() for value in values)
 
     # API configuration
     API_PREFIX: str = "/api"
@@ -76,11 +100,13 @@ class MockSyftClient:
 
     def __init__(self, email: str = "dev@test.local"):
         self.email = email
-        self._base_path = Path("/tmp/syftbox_mock")
+        self._base_path = Path(settings.MOCK_SYFTBOX_PATH)
         # Add my_datasite property
         self.my_datasite = self._base_path / "datasites" / self.email
         # Add datasites property to match real Client
         self.datasites = self._base_path / "datasites"
+        # syft URLs differ only by file name, so build the prefix once
+        self._url_prefix = f"syft://{email}/app_data/file_management/storage/"
 
     def app_data(self, name: str) -> Path:
         """Return app data path."""
@@ -92,52 +118,96 @@ class MockSyftClient:
 
     def to_syft_url(self, file_path: Path) -> str:
         """Generate mock syft URL."""
-        return f"syft://{self.email}/app_data/file_management/storage/{file_path.name}"
+        return self._url_prefix + file_path.name
 
 
 settings = Settings()
 
-# Declare syft_client with union type
-syft_client: Union[Client, MockSyftClient]
 
-# Initialize based on environment
-if settings.APP_ENV == "production":
-    # Production: require real syft_core
-    try:
-        syft_client = Client.load()
-
-        # Create app-specific storage paths
-        APP_DATA_PATH = syft_client.app_data("file_management")
-        FILE_STORAGE_PATH = APP_DATA_PATH / "storage"
-        METADATA_PATH = APP_DATA_PATH / "metadata"
+def build_syft_client(env: str) -> Union[Client, MockSyftClient]:
+    """Create the syft client for ``env``.
 
-        # Ensure directories exist
-        syft_client.makedirs(FILE_STORAGE_PATH)
-        syft_client.makedirs(METADATA_PATH)
+    Production requires a configured SyftBox; development and testing use
+    ``MockSyftClient``.
+    """
+    if env != "production":
+        return MockSyftClient()
 
-        # Store user email for syft URL generation
-        settings.SYFT_USER_EMAIL = syft_client.email
-
-        print(f"Syft core initialized. Storage path: {FILE_STORAGE_PATH}")
+    try:
+        return Client.load()
     except SyftBoxException as e:
         raise RuntimeError(
             f"Failed to initialize syft_core: {e}. "
             "SyftBox must be properly configured. "
             "Please run 'syftbox init' or check your configuration."
         )
+
+
+@dataclass(frozen=True)
+class AppConfig:
+    """Syft client and storage directories for one environment."""
+
+    env: str
+    syft_client: Union[Client, MockSyftClient]
+    app_data_path: Path
+    storage_path: Path
+    metadata_path: Path
+
+
+def make_config(env: str) -> AppConfig:
+    """Build the syft client and storage directories for ``env``.
+
+    The directories are created if missing. Tests build a config per
+    environment instead of reloading this module.
+    """
+    client = build_syft_client(env)
+
+    # Create app-specific storage paths
+    app_data_path = client.app_data("file_management")
+    storage_path = app_data_path / "storage"
+    metadata_path = app_data_path / "metadata"
+
+    # Ensure directories exist
+    client.makedirs(storage_path)
+    client.makedirs(metadata_path)
+
+    return AppConfig(
+        env=env,
+        syft_client=client,
+        app_data_path=app_data_path,
+        storage_path=storage_path,
+        metadata_path=metadata_path,
+    )
+
+
+# Initialize based on environment
+app_config = make_config(settings.APP_ENV)
+syft_client = app_config.syft_client
+APP_DATA_PATH = app_config.app_data_path
+FILE_STORAGE_PATH = app_config.storage_path
+METADATA_PATH = app_config.metadata_path
+
+# Store user email for syft URL generation
+settings.SYFT_USER_EMAIL = syft_client.email
+
+if settings.APP_ENV == "production":
+    print(f"Syft core initialized. Storage path: {FILE_STORAGE_PATH}")
 else:
-    # Development/Testing: use mock
-    syft_client = MockSyftClient()
     print(f"Running in {settings.APP_ENV} mode with mock syft_core")
 
-    # Set paths based on mock client
-    APP_DATA_PATH = syft_client.app_data("file_management")
-    FILE_STORAGE_PATH = APP_DATA_PATH / "storage"
-    METADATA_PATH = APP_DATA_PATH / "metadata"
 
-    # Ensure directories exist
-    syft_client.makedirs(FILE_STORAGE_PATH)
-    syft_client.makedirs(METADATA_PATH)
+def get_settings() -> Settings:
+    """Dependency returning the application settings.
+
+    Tests swap in adjusted settings by overriding this dependency.
+    """
+    return settings
+
+
+def get_storage_paths() -> StoragePaths:
+    """Dependency returning the configured storage directories.
 
-    # Store user email for syft URL generation
-    settings.SYFT_USER_EMAIL = syft_client.email
+    Tests point the services at a scratch directory by overriding this
+    dependency instead of patching module attributes.
+    """
+    return StoragePaths(storage=FILE_STORAGE_PATH, metadata=METADATA_PATH)
@@ -15,6 +15,9 @@ class FileMetadata(BaseModel):
     mime_type: str
     upload_date: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     syft_url: str = Field(..., description="SyftBox URL for file access")
+    checksum: Optional[str] = Field(
+        default=None, description="Hash of the file contents, computed while saving"
+    )
 
     @field_serializer("upload_date")
     def serialize_datetime(self, dt: datetime) -> str:
@@ -1,24 +1,43 @@
 import mimetypes
-from typing import Annotated
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, File, Header, HTTPException, UploadFile
+from fastapi.responses import FileResponse, ORJSONResponse, Response
 
+from app.config import Settings, StoragePaths, get_settings, get_storage_paths
 from app.models.file import (
     ErrorResponse,
     FileDeleteResponse,
     FileListResponse,
+    FileMetadata,
     FileUpdateResponse,
     FileUploadResponse,
 )
-from app.services.file_service import FileService
+from app.services.file_service import (
+    DiskStorageBackend,
+    FileService,
+    StorageBackend,
+    get_storage_backend,
+)
 
-router = APIRouter(prefix="/files", tags=["files"])
+router = APIRouter(
+    prefix="/files", tags=["files"], default_response_class=ORJSONResponse
+)
 
 
-def get_file_service() -> FileService:
+def get_file_service(
+    paths: Annotated[StoragePaths, Depends(get_storage_paths)],
+    backend: Annotated[StorageBackend, Depends(get_storage_backend)],
+    config: Annotated[Settings, Depends(get_settings)],
+) -> FileService:
     """Dependency to get FileService instance."""
-    return FileService()
+    return FileService(paths, backend, config)
+
+
+def file_etag(metadata: FileMetadata) -> str:
+    """ETag for a stored file: its checksum, or its ID and upload time."""
+    version = metadata.checksum or f"{metadata.id}-{metadata.upload_date.timestamp()}"
+    return f'"{version}"'
 
 
 @router.post(
@@ -91,17 +110,26 @@ async def list_files(
 async def download_file(
     file_id: str,
     service: Annotated[FileService, Depends(get_file_service)],
-) -> FileResponse:
+    if_none_match: Annotated[Optional[str], Header()] = None,
+) -> Response:
     """
     Download a file by ID.
 
     - **file_id**: The unique identifier of the file
 
-    Returns the file content with appropriate headers.
+    Returns the file content with appropriate headers, or 304 Not Modified
+    when If-None-Match matches the file's ETag.
     """
     try:
         file_path, metadata = await service.get_file(file_id)
 
+        etag = file_etag(metadata)
+        if if_none_match and (
+            if_none_match.strip() == "*"
+            or etag in (tag.strip() for tag in if_none_match.split(","))
+        ):
+            return Response(status_code=304, headers={"ETag": etag})
+
         # Determine media type
         media_type = metadata.mime_type
         if not media_type:
@@ -109,14 +137,23 @@ async def download_file(
                 mimetypes.guess_type(metadata.filename)[0] or "application/octet-stream"
             )
 
-        # Return file response
-        return FileResponse(
-            path=file_path,
+        headers = {
+            "Content-Disposition": f'attachment; filename="{metadata.original_filename}"',
+            "ETag": etag,
+        }
+
+        # Stream straight from disk when possible
+        if isinstance(service.backend, DiskStorageBackend):
+            return FileResponse(
+                path=file_path,
+                media_type=media_type,
+                filename=metadata.original_filename,
+                headers=headers,
+            )
+        return Response(
+            content=service.backend.read(file_path),
             media_type=media_type,
-            filename=metadata.original_filename,
-            headers={
-                "Content-Disposition": f'attachment; filename="{metadata.original_filename}"'
-            },
+            headers=headers,
         )
     except HTTPException:
         raise
@@ -3,7 +3,9 @@
 from typing import Annotated, Any, Dict, List, Union
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 
+from app.config import Settings, StoragePaths, get_settings, get_storage_paths
 from app.models.permissions import (
     BulkPermissionRequest,
     PermissionList,
@@ -11,14 +13,19 @@ from app.models.permissions import (
     PermissionResponse,
     PermissionUpdate,
 )
+from app.services.file_service import StorageBackend, get_storage_backend
 from app.services.permission_service import PermissionService
 
-router = APIRouter(tags=["permissions"])
+router = APIRouter(tags=["permissions"], default_response_class=ORJSONResponse)
 
 
-def get_permission_service() -> PermissionService:
+def get_permission_service(
+    paths: Annotated[StoragePaths, Depends(get_storage_paths)],
+    backend: Annotated[StorageBackend, Depends(get_storage_backend)],
+    config: Annotated[Settings, Depends(get_settings)],
+) -> PermissionService:
     """Dependency to get permission service instance."""
-    return PermissionService()
+    return PermissionService(paths, backend, config)
 
 
 @router.get("/files/{file_id}/permissions", response_model=PermissionList)
@@ -161,15 +168,10 @@ async def check_permission(
     """
     try:
         # Get file metadata to construct path
-        from app.services.file_service import FileService
-
-        file_service = FileService()
-        _, metadata = await file_service.get_file(file_id)
+        _, metadata = await service.file_service.get_file(file_id)
 
         # Get actual file path
-        from app.config import FILE_STORAGE_PATH
-
-        file_path = FILE_STORAGE_PATH / f"{file_id}_{metadata.filename}"
+        file_path = service.storage_path / f"{file_id}_{metadata.filename}"
 
         # Check permission
         has_permission = service.check_permission(file_path, user, permission)
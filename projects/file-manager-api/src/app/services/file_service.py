@@ -1,15 +1,24 @@
-import json
+import os
 import shutil
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional
-
-from fastapi import HTTPException, UploadFile
-
-from app.config import FILE_STORAGE_PATH, METADATA_PATH, settings, syft_client
+from typing import Annotated, BinaryIO, List, Optional, Protocol, cast
+
+import orjson
+from fastapi import Depends, HTTPException, UploadFile
+
+from app.config import (
+    Settings,
+    StoragePaths,
+    get_settings,
+    get_storage_paths,
+    settings,
+    syft_client,
+)
 from app.models.file import FileListItem, FileMetadata
 from app.utils.file_utils import (
+    HashingReader,
     ensure_directory_exists,
     generate_storage_filename,
     sanitize_filename,
@@ -18,15 +27,80 @@ from app.utils.file_utils import (
 )
 
 
+class StorageBackend(Protocol):
+    """Byte storage used by FileService for file contents and metadata."""
+
+    def ensure_dir(self, path: Path) -> None: ...
+    def save(self, path: Path, source: BinaryIO) -> None: ...
+    def write(self, path: Path, data: bytes) -> None: ...
+    def read(self, path: Path) -> bytes: ...
+    def delete(self, path: Path) -> None: ...
+    def exists(self, path: Path) -> bool: ...
+    def list(self, directory: Path, pattern: str) -> List[Path]: ...
+
+
+class DiskStorageBackend:
+    """Storage backend writing to the local filesystem."""
+
+    def __init__(self, config: Optional[Settings] = None) -> None:
+        self.config = config or settings
+
+    def _flush(self, buffer: BinaryIO) -> None:
+        """Force written data to disk when durable writes are enabled."""
+        if self.config.FSYNC_ON_WRITE:
+            buffer.flush()
+            os.fsync(buffer.fileno())
+
+    def ensure_dir(self, path: Path) -> None:
+        ensure_directory_exists(path)
+
+    def save(self, path: Path, source: BinaryIO) -> None:
+        with open(path, "wb") as buffer:
+            shutil.copyfileobj(source, buffer)
+            self._flush(buffer)
+
+    def write(self, path: Path, data: bytes) -> None:
+        with open(path, "wb") as buffer:
+            buffer.write(data)
+            self._flush(buffer)
+
+    def read(self, path: Path) -> bytes:
+        return path.read_bytes()
+
+    def delete(self, path: Path) -> None:
+        path.unlink(missing_ok=True)
+
+    def exists(self, path: Path) -> bool:
+        return path.exists()
+
+    def list(self, directory: Path, pattern: str) -> List[Path]:
+        return list(directory.glob(pattern))
+
+
+def get_storage_backend(
+    config: Annotated[Settings, Depends(get_settings)],
+) -> StorageBackend:
+    """Dependency to get the storage backend."""
+    return DiskStorageBackend(config)
+
+
 class FileService:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        paths: Optional[StoragePaths] = None,
+        backend: Optional[StorageBackend] = None,
+        config: Optional[Settings] = None,
+    ) -> None:
         if not syft_client:
             raise RuntimeError("FileService requires syft_core to be initialized")
 
-        self.storage_path = FILE_STORAGE_PATH
-        ensure_directory_exists(self.storage_path)
-        self.metadata_path = METADATA_PATH
-        ensure_directory_exists(self.metadata_path)
+        self.paths = paths or get_storage_paths()
+        self.settings = config or settings
+        self.backend = backend or DiskStorageBackend(self.settings)
+        self.storage_path = self.paths.storage
+        self.backend.ensure_dir(self.storage_path)
+        self.metadata_path = self.paths.metadata
+        self.backend.ensure_dir(self.metadata_path)
 
     def _get_metadata_file_path(self, file_id: str) -> Path:
         """Get the path to a file's metadata JSON file."""
@@ -35,27 +109,27 @@ class FileService:
     def _save_metadata(self, metadata: FileMetadata) -> None:
         """Save file metadata to JSON file."""
         metadata_file = self._get_metadata_file_path(metadata.id)
-        with open(metadata_file, "w") as f:
-            json.dump(metadata.model_dump(), f, default=str)
+        self.backend.write(
+            metadata_file, orjson.dumps(metadata.model_dump(), default=str)
+        )
 
     def _load_metadata(self, file_id: str) -> Optional[FileMetadata]:
         """Load file metadata from JSON file."""
         metadata_file = self._get_metadata_file_path(file_id)
-        if not metadata_file.exists():
+        if not self.backend.exists(metadata_file):
             return None
 
-        with open(metadata_file, "r") as f:
-            data = json.load(f)
-            # Convert datetime strings back to datetime objects
-            if "upload_date" in data:
-                data["upload_date"] = datetime.fromisoformat(data["upload_date"])
-            return FileMetadata(**data)
+        data = orjson.loads(self.backend.read(metadata_file))
+        # Convert datetime strings back to datetime objects
+        if "upload_date" in data:
+            data["upload_date"] = datetime.fromisoformat(data["upload_date"])
+        return FileMetadata(**data)
 
     def _delete_metadata(self, file_id: str) -> None:
         """Delete file metadata JSON file."""
         metadata_file = self._get_metadata_file_path(file_id)
-        if metadata_file.exists():
-            metadata_file.unlink()
+        if self.backend.exists(metadata_file):
+            self.backend.delete(metadata_file)
 
     def _generate_syft_url(self, file_path: Path) -> str:
         """Generate syft:// URL for a file. Raises error if syft_core not configured."""
@@ -87,17 +161,17 @@ class FileService:
         file.file.seek(0)  # Reset to beginning
 
         # Validate file size
-        if not validate_file_size(file_size):
+        if not validate_file_size(file_size, self.settings):
             raise HTTPException(
                 status_code=413,
-                detail=f"File size exceeds maximum allowed size of {settings.MAX_FILE_SIZE} bytes",
+                detail=f"File size exceeds maximum allowed size of {self.settings.MAX_FILE_SIZE} bytes",
             )
 
         # Validate file type
         if (
             not file.content_type
             or not file.filename
-            or not validate_file_type(file.content_type, file.filename)
+            or not validate_file_type(file.content_type, file.filename, self.settings)
         ):
             raise HTTPException(status_code=415, detail="File type not allowed")
 
@@ -125,17 +199,18 @@ class FileService:
         )
 
         try:
-            # Save file to disk
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+            # Save file to storage, hashing it on the way
+            reader = HashingReader(file.file)
+            self.backend.save(file_path, cast(BinaryIO, reader))
+            metadata.checksum = reader.hexdigest()
 
             # Save metadata
             self._save_metadata(metadata)
 
         except IOError:
             # Clean up on failure
-            if file_path.exists():
-                file_path.unlink()
+            if self.backend.exists(file_path):
+                self.backend.delete(file_path)
             raise HTTPException(
                 status_code=500, detail="Failed to save file to storage"
             )
@@ -164,7 +239,7 @@ class FileService:
         storage_filename = generate_storage_filename(metadata.id, metadata.filename)
         file_path = self.storage_path / storage_filename
 
-        if not file_path.exists():
+        if not self.backend.exists(file_path):
             raise HTTPException(status_code=404, detail="File not found in storage")
 
         return file_path, metadata
@@ -179,7 +254,7 @@ class FileService:
         files = []
 
         # Iterate through all metadata files
-        for metadata_file in self.metadata_path.glob("*.json"):
+        for metadata_file in self.backend.list(self.metadata_path, "*.json"):
             file_id = metadata_file.stem
             metadata = self._load_metadata(file_id)
 
@@ -190,7 +265,7 @@ class FileService:
                 )
                 file_path = self.storage_path / storage_filename
 
-                if file_path.exists():
+                if self.backend.exists(file_path):
                     # Generate syft URL for the file
                     syft_url = self._generate_syft_url(file_path)
 
@@ -240,16 +315,18 @@ class FileService:
         new_file.file.seek(0)
 
         # Validate new file
-        if not validate_file_size(file_size):
+        if not validate_file_size(file_size, self.settings):
             raise HTTPException(
                 status_code=413,
-                detail=f"File size exceeds maximum allowed size of {settings.MAX_FILE_SIZE} bytes",
+                detail=f"File size exceeds maximum allowed size of {self.settings.MAX_FILE_SIZE} bytes",
             )
 
         if (
             not new_file.content_type
             or not new_file.filename
-            or not validate_file_type(new_file.content_type, new_file.filename)
+            or not validate_file_type(
+                new_file.content_type, new_file.filename, self.settings
+            )
         ):
             raise HTTPException(status_code=415, detail="File type not allowed")
 
@@ -283,21 +360,22 @@ class FileService:
         )
 
         try:
-            # Save new file
-            with open(new_file_path, "wb") as buffer:
-                shutil.copyfileobj(new_file.file, buffer)
+            # Save new file, hashing it on the way
+            reader = HashingReader(new_file.file)
+            self.backend.save(new_file_path, cast(BinaryIO, reader))
+            new_metadata.checksum = reader.hexdigest()
 
             # Remove old file if it exists and is different
-            if old_file_path.exists() and old_file_path != new_file_path:
-                old_file_path.unlink()
+            if self.backend.exists(old_file_path) and old_file_path != new_file_path:
+                self.backend.delete(old_file_path)
 
             # Update metadata
             self._save_metadata(new_metadata)
 
         except IOError:
             # Clean up on failure
-            if new_file_path.exists() and new_file_path != old_file_path:
-                new_file_path.unlink()
+            if self.backend.exists(new_file_path) and new_file_path != old_file_path:
+                self.backend.delete(new_file_path)
             raise HTTPException(status_code=500, detail="Failed to update file")
 
         return new_metadata
@@ -325,8 +403,8 @@ class FileService:
         file_path = self.storage_path / storage_filename
 
         try:
-            if file_path.exists():
-                file_path.unlink()
+            if self.backend.exists(file_path):
+                self.backend.delete(file_path)
 
             # Delete metadata
             self._delete_metadata(file_id)
@@ -346,7 +424,7 @@ class FileService:
         total_files = 0
         total_size = 0
 
-        for metadata_file in self.metadata_path.glob("*.json"):
+        for metadata_file in self.backend.list(self.metadata_path, "*.json"):
             metadata = self._load_metadata(metadata_file.stem)
             if metadata:
                 total_files += 1
@@ -355,6 +433,6 @@ class FileService:
         return {
             "total_files": total_files,
             "total_size": total_size,
-            "max_file_size": settings.MAX_FILE_SIZE,
+            "max_file_size": self.settings.MAX_FILE_SIZE,
             "storage_path": str(self.storage_path),
         }
@@ -4,7 +4,7 @@ import json
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from fastapi import HTTPException, status
 
@@ -28,7 +28,7 @@ except ImportError:
 
 import re
 
-from app.config import FILE_STORAGE_PATH, syft_client
+from app.config import Settings, StoragePaths, get_storage_paths, syft_client
 from app.models.permissions import (
     BulkPermissionRequest,
     PermissionList,
@@ -36,18 +36,26 @@ from app.models.permissions import (
     PermissionResponse,
     PermissionUpdate,
 )
-from app.services.file_service import FileService
+from app.services.file_service import FileService, StorageBackend
 
 
 class PermissionService:
     """Service for managing file and folder permissions using SyftBox."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        paths: Optional[StoragePaths] = None,
+        backend: Optional[StorageBackend] = None,
+        config: Optional[Settings] = None,
+    ) -> None:
         """Initialize the permission service."""
         if not syft_client:
             raise RuntimeError("SyftBox client not initialized")
         self.syft_client = syft_client
-        self.storage_path = FILE_STORAGE_PATH
+        self.paths = paths or get_storage_paths()
+        self.storage_path = self.paths.storage
+        # File metadata lives wherever the file service stores it
+        self.file_service = FileService(self.paths, backend, config)
 
     def _get_permission_file_path(self, file_path: Path) -> Path:
         """Get the path to the .syftperm file for a given path."""
@@ -111,8 +119,7 @@ class PermissionService:
     async def get_permissions(self, file_id: str) -> PermissionList:
         """Get all permissions for a file."""
         # Get file metadata
-        file_service = FileService()
-        _, metadata = await file_service.get_file(file_id)
+        _, metadata = await self.file_service.get_file(file_id)
 
         # Get actual file path
         file_path = self.storage_path / f"{file_id}_{metadata.filename}"
@@ -151,8 +158,7 @@ class PermissionService:
     ) -> PermissionResponse:
         """Grant permissions to a user for a file."""
         # Get file metadata
-        file_service = FileService()
-        _, metadata = await file_service.get_file(file_id)
+        _, metadata = await self.file_service.get_file(file_id)
 
         # Get actual file path
         file_path = self.storage_path / f"{file_id}_{metadata.filename}"
@@ -220,8 +226,7 @@ class PermissionService:
     ) -> PermissionResponse:
         """Update an existing permission rule."""
         # Get file metadata
-        file_service = FileService()
-        _, metadata = await file_service.get_file(file_id)
+        _, metadata = await self.file_service.get_file(file_id)
 
         # Get actual file path
         file_path = self.storage_path / f"{file_id}_{metadata.filename}"
@@ -281,8 +286,7 @@ class PermissionService:
     ) -> Dict[str, str]:
         """Revoke a permission rule."""
         # Get file metadata
-        file_service = FileService()
-        _, metadata = await file_service.get_file(file_id)
+        _, metadata = await self.file_service.get_file(file_id)
 
         # Get actual file path
         file_path = self.storage_path / f"{file_id}_{metadata.filename}"
@@ -1,16 +1,26 @@
 import os
 import shutil
-import tempfile
+from fnmatch import fnmatch
 from pathlib import Path
+from typing import BinaryIO, Dict, List
 
 # Set test environment before any app imports
 os.environ["APP_ENV"] = "testing"
+# Give each pytest-xdist worker its own mock SyftBox so cleanups don't collide
+os.environ["MOCK_SYFTBOX_PATH"] = (
+    f"/tmp/syftbox_mock-{os.environ.get('PYTEST_XDIST_WORKER', 'main')}"
+)
 
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 
+from app.config import settings
 from app.main import app
 
+MOCK_SYFTBOX_ROOT = Path(os.environ["MOCK_SYFTBOX_PATH"])
+
 
 @pytest.fixture(autouse=True)
 def test_environment(monkeypatch):
@@ -19,9 +29,42 @@ def test_environment(monkeypatch):
 
 
 @pytest.fixture
+def settings_override(monkeypatch):
+    """Return a callable that overrides app settings for the current test.
+
+    Every module shares the ``settings`` object from ``app.config``, so
+    patching its attributes directly reaches all of them.
+    """
+
+    def apply(**overrides):
+        for name, value in overrides.items():
+            monkeypatch.setattr(settings, name, value)
+
+    return apply
+
+
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client for the FastAPI app."""
-    return TestClient(app)
+    """Create one test client for the FastAPI app for the whole session.
+
+    The app lifespan (SyftBox startup check) runs once when the session
+    starts; per-test state lives on disk and is reset by
+    ``cleanup_test_storage``.
+    """
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest_asyncio.fixture
+async def async_client():
+    """Create an async client that drives the app directly over ASGI.
+
+    Requests run on the test's event loop instead of TestClient's worker
+    thread. The app lifespan is not run.
+    """
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as ac:
+        yield ac
 
 
 @pytest.fixture
@@ -30,12 +73,12 @@ def mock_data():
     return {"test_name": "TestUser", "expected_message": "Hello from toy-project!"}
 
 
-@pytest.fixture
-def temp_test_dir():
-    """Create a temporary directory for test isolation."""
-    temp_dir = tempfile.mkdtemp()
+@pytest.fixture(scope="session")
+def temp_test_dir(tmp_path_factory):
+    """Create one temporary directory for the whole test session."""
+    temp_dir = tmp_path_factory.mktemp("file-manager")
     yield temp_dir
-    # Cleanup after test
+    # Remove it right away instead of leaving it to pytest's retention policy
     shutil.rmtree(temp_dir, ignore_errors=True)
 
 
@@ -63,9 +106,12 @@ def mock_syft_client(monkeypatch):
     return mock_client
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_syft_client_custom():
-    """Provide a customizable mock syft client."""
+    """Provide a mock syft client shared by the whole session.
+
+    MockSyftClient holds no per-test state, so one instance is enough.
+    """
     from app.config import MockSyftClient
 
     return MockSyftClient("test@example.com")
@@ -85,18 +131,13 @@ def ensure_syft_client(monkeypatch, mock_syft_client_custom):
     return mock_syft_client_custom
 
 
-@pytest.fixture(autouse=True)
-def cleanup_test_storage():
-    """Clean up test storage before and after each test."""
+def _reset_test_storage():
+    """Wipe the mock syft storage and recreate empty storage directories."""
     # Import here to ensure it's after environment setup
     from app.config import FILE_STORAGE_PATH, METADATA_PATH
 
-    # Get the base storage directory
-    test_storage = Path("/tmp/syftbox_mock")
-
-    # Clean before test
-    if test_storage.exists():
-        shutil.rmtree(test_storage, ignore_errors=True)
+    if MOCK_SYFTBOX_ROOT.exists():
+        shutil.rmtree(MOCK_SYFTBOX_ROOT, ignore_errors=True)
 
     # Also clean the specific storage paths
     if FILE_STORAGE_PATH.exists():
@@ -108,8 +149,68 @@ def cleanup_test_storage():
     FILE_STORAGE_PATH.mkdir(parents=True, exist_ok=True)
     METADATA_PATH.mkdir(parents=True, exist_ok=True)
 
+
+@pytest.fixture(autouse=True)
+def cleanup_test_storage():
+    """Clean up test storage before and after each test."""
+    _reset_test_storage()
+
     yield
 
     # Clean after test
-    if test_storage.exists():
-        shutil.rmtree(test_storage, ignore_errors=True)
+    shutil.rmtree(MOCK_SYFTBOX_ROOT, ignore_errors=True)
+
+
+@pytest.fixture(scope="module")
+def module_test_storage():
+    """Clean test storage once per module.
+
+    Modules that share uploads across tests override ``cleanup_test_storage``
+    with a fixture depending on this one.
+    """
+    _reset_test_storage()
+
+    yield
+
+    shutil.rmtree(MOCK_SYFTBOX_ROOT, ignore_errors=True)
+
+
+class InMemoryStorageBackend:
+    """Storage backend keeping file contents in a dict instead of on disk."""
+
+    def __init__(self) -> None:
+        self.files: Dict[Path, bytes] = {}
+
+    def ensure_dir(self, path: Path) -> None:
+        pass
+
+    def save(self, path: Path, source: BinaryIO) -> None:
+        self.files[path] = source.read()
+
+    def write(self, path: Path, data: bytes) -> None:
+        self.files[path] = data
+
+    def read(self, path: Path) -> bytes:
+        try:
+            return self.files[path]
+        except KeyError:
+            raise FileNotFoundError(path)
+
+    def delete(self, path: Path) -> None:
+        self.files.pop(path, None)
+
+    def exists(self, path: Path) -> bool:
+        return path in self.files
+
+    def list(self, directory: Path, pattern: str) -> List[Path]:
+        return [
+            path
+            for path in self.files
+            if path.parent == directory and fnmatch(path.name, pattern)
+        ]
+
+
+@pytest.fixture
+def memory_backend():
+    """Provide an empty in-memory storage backend."""
+    return InMemoryStorageBackend()
@@ -1,7 +1,5 @@
 from pathlib import Path
 
-import pytest
-
 
 class TestSyftCoreConfiguration:
     """Test syft_core configuration and initialization."""
@@ -47,9 +45,3 @@ class TestSyftCoreConfiguration:
         assert METADATA_PATH is not None
         assert "storage" in str(FILE_STORAGE_PATH)
         assert "metadata" in str(METADATA_PATH)
-
-    @pytest.fixture(autouse=True)
-    def reset_config(self):
-        """Reset config module after each test."""
-        yield
-        # Config is already loaded, no need to reload
@@ -1,6 +1,9 @@
 import pytest
 
-from app.config import settings
+from app.config import get_settings, settings
+from app.main import app
+
+FILES_URL = f"{settings.API_PREFIX}/files/"
 
 
 class TestSyftCoreIntegration:
@@ -11,7 +14,7 @@ class TestSyftCoreIntegration:
         """Test complete file management workflow with syft_core enabled."""
         # 1. Upload a file
         files = {"file": ("test.txt", b"Original content for testing", "text/plain")}
-        upload_resp = client.post(f"{settings.API_PREFIX}/files/", files=files)
+        upload_resp = client.post(FILES_URL, files=files)
 
         assert upload_resp.status_code == 201
         upload_data = upload_resp.json()
@@ -24,7 +27,7 @@ class TestSyftCoreIntegration:
         assert "test.txt" in syft_url
 
         # 2. List files and verify syft_url is included
-        list_resp = client.get(f"{settings.API_PREFIX}/files/")
+        list_resp = client.get(FILES_URL)
         assert list_resp.status_code == 200
 
         list_data = list_resp.json()
@@ -40,16 +43,14 @@ class TestSyftCoreIntegration:
         assert uploaded_file["syft_url"] == syft_url
 
         # 3. Download the file
-        download_resp = client.get(f"{settings.API_PREFIX}/files/{file_id}")
+        download_resp = client.get(f"{FILES_URL}{file_id}")
         assert download_resp.status_code == 200
         assert download_resp.content == b"Original content for testing"
         assert download_resp.headers["content-type"] == "text/plain; charset=utf-8"
 
         # 4. Update the file
         new_files = {"file": ("updated.txt", b"New content after update", "text/plain")}
-        update_resp = client.put(
-            f"{settings.API_PREFIX}/files/{file_id}", files=new_files
-        )
+        update_resp = client.put(f"{FILES_URL}{file_id}", files=new_files)
 
         assert update_resp.status_code == 200
         update_data = update_resp.json()
@@ -59,12 +60,12 @@ class TestSyftCoreIntegration:
         assert "updated.txt" in update_data["syft_url"]
 
         # Verify content was updated
-        download_resp = client.get(f"{settings.API_PREFIX}/files/{file_id}")
+        download_resp = client.get(f"{FILES_URL}{file_id}")
         assert download_resp.status_code == 200
         assert download_resp.content == b"New content after update"
 
         # 5. Get storage stats
-        stats_resp = client.get(f"{settings.API_PREFIX}/files/stats/summary")
+        stats_resp = client.get(f"{FILES_URL}stats/summary")
         assert stats_resp.status_code == 200
 
         stats_data = stats_resp.json()
@@ -73,19 +74,20 @@ class TestSyftCoreIntegration:
         assert "storage_path" in stats_data
 
         # 6. Delete the file
-        delete_resp = client.delete(f"{settings.API_PREFIX}/files/{file_id}")
+        delete_resp = client.delete(f"{FILES_URL}{file_id}")
         assert delete_resp.status_code == 200
         assert delete_resp.json()["message"] == "File deleted successfully"
 
         # Verify deletion
-        get_resp = client.get(f"{settings.API_PREFIX}/files/{file_id}")
-        assert get_resp.status_code == 404
+        with client.stream("GET", f"{FILES_URL}{file_id}") as get_resp:
+            assert get_resp.status_code == 404
 
         # Verify file is removed from list
-        list_resp = client.get(f"{settings.API_PREFIX}/files/")
+        list_resp = client.get(FILES_URL)
         assert list_resp.status_code == 200
-        assert list_resp.json()["total"] == 0
-        assert list_resp.json()["files"] == []
+        list_data = list_resp.json()
+        assert list_data["total"] == 0
+        assert list_data["files"] == []
 
     @pytest.mark.integration
     def test_complete_workflow_without_syft(self, client):
@@ -94,7 +96,7 @@ class TestSyftCoreIntegration:
 
         # 1. Upload a file
         files = {"file": ("test_no_syft.txt", b"Content without syft", "text/plain")}
-        upload_resp = client.post(f"{settings.API_PREFIX}/files/", files=files)
+        upload_resp = client.post(FILES_URL, files=files)
 
         assert upload_resp.status_code == 201
         upload_data = upload_resp.json()
@@ -104,7 +106,7 @@ class TestSyftCoreIntegration:
         assert upload_data.get("syft_url") is not None  # Always has syft_url now
 
         # 2. List files and verify syft_url is included
-        list_resp = client.get(f"{settings.API_PREFIX}/files/")
+        list_resp = client.get(FILES_URL)
         assert list_resp.status_code == 200
 
         list_data = list_resp.json()
@@ -113,22 +115,20 @@ class TestSyftCoreIntegration:
         assert file_item["syft_url"] is not None
 
         # 3. Download works normally
-        download_resp = client.get(f"{settings.API_PREFIX}/files/{file_id}")
+        download_resp = client.get(f"{FILES_URL}{file_id}")
         assert download_resp.status_code == 200
         assert download_resp.content == b"Content without syft"
 
         # 4. Update with syft_url
         new_files = {"file": ("updated_no_syft.txt", b"Updated no syft", "text/plain")}
-        update_resp = client.put(
-            f"{settings.API_PREFIX}/files/{file_id}", files=new_files
-        )
+        update_resp = client.put(f"{FILES_URL}{file_id}", files=new_files)
 
         assert update_resp.status_code == 200
         update_data = update_resp.json()
         assert update_data["syft_url"] is not None  # Always has syft_url now
 
         # 5. Delete works normally
-        delete_resp = client.delete(f"{settings.API_PREFIX}/files/{file_id}")
+        delete_resp = client.delete(f"{FILES_URL}{file_id}")
         assert delete_resp.status_code == 200
 
     @pytest.mark.integration
@@ -146,7 +146,7 @@ class TestSyftCoreIntegration:
 
         for filename, content, content_type in test_files:
             files = {"file": (filename, content, content_type)}
-            response = client.post(f"{settings.API_PREFIX}/files/", files=files)
+            response = client.post(FILES_URL, files=files)
             assert response.status_code == 201
 
             data = response.json()
@@ -161,7 +161,7 @@ class TestSyftCoreIntegration:
         assert len(set(uploaded_urls)) == len(uploaded_urls)
 
         # List all files
-        list_resp = client.get(f"{settings.API_PREFIX}/files/")
+        list_resp = client.get(FILES_URL)
         assert list_resp.status_code == 200
 
         list_data = list_resp.json()
@@ -179,36 +179,34 @@ class TestSyftCoreIntegration:
         files = {
             "file": ("script.exe", b"Executable content", "application/x-executable")
         }
-        response = client.post(f"{settings.API_PREFIX}/files/", files=files)
+        response = client.post(FILES_URL, files=files)
         assert response.status_code == 415
 
         # Test oversized file
-        import app.utils.file_utils
-
-        original_size = app.utils.file_utils.settings.MAX_FILE_SIZE
-        app.utils.file_utils.settings.MAX_FILE_SIZE = 10  # Set to 10 bytes temporarily
+        limited = settings.model_copy(update={"MAX_FILE_SIZE": 10})  # 10 bytes
+        app.dependency_overrides[get_settings] = lambda: limited
 
         try:
             files = {"file": ("large.txt", b"This content is too large", "text/plain")}
-            response = client.post(f"{settings.API_PREFIX}/files/", files=files)
+            response = client.post(FILES_URL, files=files)
             assert response.status_code == 413
         finally:
-            app.utils.file_utils.settings.MAX_FILE_SIZE = original_size
+            app.dependency_overrides.pop(get_settings, None)
 
         # Test non-existent file operations
         fake_id = "non-existent-file-id"
 
         # Download non-existent
-        response = client.get(f"{settings.API_PREFIX}/files/{fake_id}")
-        assert response.status_code == 404
+        with client.stream("GET", f"{FILES_URL}{fake_id}") as response:
+            assert response.status_code == 404
 
         # Update non-existent
         files = {"file": ("new.txt", b"New content", "text/plain")}
-        response = client.put(f"{settings.API_PREFIX}/files/{fake_id}", files=files)
+        response = client.put(f"{FILES_URL}{fake_id}", files=files)
         assert response.status_code == 404
 
         # Delete non-existent
-        response = client.delete(f"{settings.API_PREFIX}/files/{fake_id}")
+        response = client.delete(f"{FILES_URL}{fake_id}")
         assert response.status_code == 404
 
     @pytest.mark.integration
@@ -227,7 +225,7 @@ class TestSyftCoreIntegration:
             files = {
                 "file": (filename, f"{description} content".encode(), "text/plain")
             }
-            response = client.post(f"{settings.API_PREFIX}/files/", files=files)
+            response = client.post(FILES_URL, files=files)
 
             assert (
                 response.status_code == 201
@@ -239,7 +237,7 @@ class TestSyftCoreIntegration:
 
             # Verify we can download the file
             file_id = data["id"]
-            download_resp = client.get(f"{settings.API_PREFIX}/files/{file_id}")
+            download_resp = client.get(f"{FILES_URL}{file_id}")
             if download_resp.status_code != 200:
                 print(f"Download failed for {filename}: {download_resp.json()}")
             assert download_resp.status_code == 200
@@ -257,14 +255,11 @@ class TestSyftCoreIntegration:
                     "text/plain",
                 )
             }
-            return client.post(f"{settings.API_PREFIX}/files/", files=files)
+            return client.post(FILES_URL, files=files)
 
         # Upload files concurrently
         with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            futures = [executor.submit(upload_file, i) for i in range(10)]
-            responses = [
-                future.result() for future in concurrent.futures.as_completed(futures)
-            ]
+            responses = list(executor.map(upload_file, range(10)))
 
         # All uploads should succeed
         assert all(r.status_code == 201 for r in responses)
@@ -275,6 +270,6 @@ class TestSyftCoreIntegration:
         assert all(url is not None for url in syft_urls)
 
         # Verify all files exist
-        list_resp = client.get(f"{settings.API_PREFIX}/files/")
+        list_resp = client.get(FILES_URL)
         assert list_resp.status_code == 200
         assert list_resp.json()["total"] == 10
@@ -1,11 +1,12 @@
 """Tests for main app endpoints including health check."""
 
 from fastapi.testclient import TestClient
+from httpx import AsyncClient
 
 
-def test_health_endpoint(client: TestClient):
+async def test_health_endpoint(async_client: AsyncClient):
     """Test health check endpoint."""
-    response = client.get("/health")
+    response = await async_client.get("/health")
 
     assert response.status_code == 200
     data = response.json()
@@ -22,9 +23,9 @@ def test_health_endpoint_when_syft_not_available(client: TestClient, monkeypatch
     pass
 
 
-def test_root_endpoint(client: TestClient):
+async def test_root_endpoint(async_client: AsyncClient):
     """Test root endpoint returns HTML."""
-    response = client.get("/")
+    response = await async_client.get("/")
 
     assert response.status_code == 200
     assert "text/html" in response.headers["content-type"]
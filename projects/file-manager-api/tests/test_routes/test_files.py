@@ -1,46 +1,59 @@
+import asyncio
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
-from fastapi.testclient import TestClient
 
-from app.config import settings
+from app.config import (
+    MockSyftClient,
+    StoragePaths,
+    get_settings,
+    get_storage_paths,
+    settings,
+)
 from app.main import app
+from app.routes.files import get_file_service
+from app.services.file_service import get_storage_backend
 
+FILES_URL = f"{settings.API_PREFIX}/files/"
+TEST_TXT = ("test.txt", b"Test content", "text/plain")
 
-@pytest.fixture(autouse=True)
-def cleanup_storage(temp_test_dir, monkeypatch):
-    """Ensure clean state between tests."""
-    storage_path = Path(temp_test_dir) / "storage"
-    metadata_path = Path(temp_test_dir) / "metadata"
 
-    # Setup clean directories
-    storage_path.mkdir(parents=True, exist_ok=True)
-    metadata_path.mkdir(parents=True, exist_ok=True)
+@pytest.fixture(scope="module", autouse=True)
+def mock_syft():
+    """Bind one mock syft client for every test in this module."""
+    mp = pytest.MonkeyPatch()
+    mock_client = MockSyftClient("test@example.com")
+    mp.setattr("app.config.syft_client", mock_client)
+    mp.setattr("app.services.file_service.syft_client", mock_client)
+    mp.setattr("app.config.settings.SYFT_USER_EMAIL", "test@example.com")
 
-    # Mock paths to use temp directory
-    monkeypatch.setattr("app.config.FILE_STORAGE_PATH", storage_path)
-    monkeypatch.setattr("app.config.METADATA_PATH", metadata_path)
-    monkeypatch.setattr("app.services.file_service.FILE_STORAGE_PATH", storage_path)
-    monkeypatch.setattr("app.services.file_service.METADATA_PATH", metadata_path)
+    yield mock_client
 
-    # Use mock syft_client for route tests
-    from app.config import MockSyftClient
+    mp.undo()
 
-    mock_client = MockSyftClient("test@example.com")
-    monkeypatch.setattr("app.config.syft_client", mock_client)
-    monkeypatch.setattr("app.services.file_service.syft_client", mock_client)
-    monkeypatch.setattr("app.config.settings.SYFT_USER_EMAIL", "test@example.com")
+
+@pytest.fixture(autouse=True)
+def cleanup_storage(temp_test_dir, memory_backend):
+    """Ensure clean state between tests."""
+    # Keep files in memory; the temp paths only namespace the stored keys
+    paths = StoragePaths(
+        storage=Path(temp_test_dir) / "storage",
+        metadata=Path(temp_test_dir) / "metadata",
+    )
+    app.dependency_overrides[get_storage_paths] = lambda: paths
+    app.dependency_overrides[get_storage_backend] = lambda: memory_backend
 
     yield
 
-    # Cleanup is handled by temp_test_dir fixture
+    app.dependency_overrides.clear()
+    # Each test gets a fresh in-memory backend, so there is nothing to wipe
 
 
-@pytest.fixture
-def client():
-    """Create a test client for the FastAPI app."""
-    # Force app reload to pick up mocked paths
-    return TestClient(app)
+@pytest.fixture(scope="module")
+def openapi_schema():
+    """Build the OpenAPI schema once, without an HTTP round trip."""
+    return app.openapi()
 
 
 class TestFileRoutes:
@@ -49,7 +62,7 @@ class TestFileRoutes:
     def test_upload_file_success(self, client):
         """Test successful file upload."""
         files = {"file": ("test.txt", b"Hello, World!", "text/plain")}
-        response = client.post(f"{settings.API_PREFIX}/files/", files=files)
+        response = client.post(FILES_URL, files=files)
 
         assert response.status_code == 201
         data = response.json()
@@ -59,15 +72,13 @@ class TestFileRoutes:
 
     def test_upload_file_no_file(self, client):
         """Test upload without file."""
-        response = client.post(f"{settings.API_PREFIX}/files/")
+        response = client.post(FILES_URL)
         assert response.status_code == 422  # Validation error
 
-    def test_upload_file_size_limit(self, client, monkeypatch):
+    def test_upload_file_size_limit(self, client):
         """Test file size limit enforcement."""
-        # Patch in the module where it's used
-        monkeypatch.setattr(
-            "app.utils.file_utils.settings.MAX_FILE_SIZE", 10
-        )  # 10 bytes limit
+        limited = settings.model_copy(update={"MAX_FILE_SIZE": 10})  # 10 bytes
+        app.dependency_overrides[get_settings] = lambda: limited
 
         files = {
             "file": (
@@ -76,32 +87,31 @@ class TestFileRoutes:
                 "text/plain",
             )
         }
-        response = client.post(f"{settings.API_PREFIX}/files/", files=files)
+        response = client.post(FILES_URL, files=files)
 
         assert response.status_code == 413
         assert "exceeds maximum allowed size" in response.json()["detail"]
 
-    def test_upload_file_invalid_type(self, client, monkeypatch):
+    def test_upload_file_invalid_type(self, client):
         """Test invalid file type rejection."""
-        # Restrict to only images - patch in the module where it's used
-        monkeypatch.setattr(
-            "app.utils.file_utils.settings.ALLOWED_MIME_TYPES",
-            {"image/jpeg", "image/png"},
-        )
-        monkeypatch.setattr(
-            "app.utils.file_utils.settings.ALLOWED_EXTENSIONS",
-            {".jpg", ".jpeg", ".png"},
+        # Restrict to only images
+        images_only = settings.model_copy(
+            update={
+                "ALLOWED_MIME_TYPES": {"image/jpeg", "image/png"},
+                "ALLOWED_EXTENSIONS": {".jpg", ".jpeg", ".png"},
+            }
         )
+        app.dependency_overrides[get_settings] = lambda: images_only
 
         files = {"file": ("test.txt", b"Text content", "text/plain")}
-        response = client.post(f"{settings.API_PREFIX}/files/", files=files)
+        response = client.post(FILES_URL, files=files)
 
         assert response.status_code == 415
         assert "File type not allowed" in response.json()["detail"]
 
     def test_list_files_empty(self, client):
         """Test listing files when none exist."""
-        response = client.get(f"{settings.API_PREFIX}/files/")
+        response = client.get(FILES_URL)
 
         assert response.status_code == 200
         data = response.json()
@@ -120,12 +130,12 @@ class TestFileRoutes:
         uploaded_ids = []
         for filename, content, content_type in test_files:
             files = {"file": (filename, content, content_type)}
-            response = client.post(f"{settings.API_PREFIX}/files/", files=files)
+            response = client.post(FILES_URL, files=files)
             assert response.status_code == 201
             uploaded_ids.append(response.json()["id"])
 
         # List files
-        response = client.get(f"{settings.API_PREFIX}/files/")
+        response = client.get(FILES_URL)
         assert response.status_code == 200
 
         data = response.json()
@@ -142,12 +152,12 @@ class TestFileRoutes:
         # Upload a file
         content = b"Download test content"
         files = {"file": ("download_test.txt", content, "text/plain")}
-        upload_response = client.post(f"{settings.API_PREFIX}/files/", files=files)
+        upload_response = client.post(FILES_URL, files=files)
         assert upload_response.status_code == 201
         file_id = upload_response.json()["id"]
 
         # Download the file
-        download_response = client.get(f"{settings.API_PREFIX}/files/{file_id}")
+        download_response = client.get(f"{FILES_URL}{file_id}")
         assert download_response.status_code == 200
         assert download_response.content == content
         assert download_response.headers["content-type"] == "text/plain; charset=utf-8"
@@ -156,9 +166,26 @@ class TestFileRoutes:
             in download_response.headers["content-disposition"]
         )
 
+    def test_download_file_not_modified(self, client):
+        """Test conditional download with the file's ETag returns 304."""
+        files = {"file": TEST_TXT}
+        file_id = client.post(FILES_URL, files=files).json()["id"]
+
+        etag = client.get(f"{FILES_URL}{file_id}").headers["etag"]
+
+        response = client.get(f"{FILES_URL}{file_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+        response = client.get(
+            f"{FILES_URL}{file_id}", headers={"If-None-Match": '"stale"'}
+        )
+        assert response.status_code == 200
+
     def test_download_file_not_found(self, client):
         """Test downloading non-existent file."""
-        response = client.get(f"{settings.API_PREFIX}/files/non-existent-id")
+        response = client.get(f"{FILES_URL}non-existent-id")
         assert response.status_code == 404
         assert "File not found" in response.json()["detail"]
 
@@ -166,15 +193,13 @@ class TestFileRoutes:
         """Test successful file update."""
         # Upload original file
         files = {"file": ("original.txt", b"Original content", "text/plain")}
-        upload_response = client.post(f"{settings.API_PREFIX}/files/", files=files)
+        upload_response = client.post(FILES_URL, files=files)
         assert upload_response.status_code == 201
         file_id = upload_response.json()["id"]
 
         # Update with new file
         new_files = {"file": ("updated.txt", b"Updated content", "text/plain")}
-        update_response = client.put(
-            f"{settings.API_PREFIX}/files/{file_id}", files=new_files
-        )
+        update_response = client.put(f"{FILES_URL}{file_id}", files=new_files)
 
         assert update_response.status_code == 200
         data = update_response.json()
@@ -183,15 +208,13 @@ class TestFileRoutes:
         assert data["message"] == "File updated successfully"
 
         # Verify content was updated
-        download_response = client.get(f"{settings.API_PREFIX}/files/{file_id}")
+        download_response = client.get(f"{FILES_URL}{file_id}")
         assert download_response.content == b"Updated content"
 
     def test_update_file_not_found(self, client):
         """Test updating non-existent file."""
         files = {"file": ("new.txt", b"New content", "text/plain")}
-        response = client.put(
-            f"{settings.API_PREFIX}/files/non-existent-id", files=files
-        )
+        response = client.put(f"{FILES_URL}non-existent-id", files=files)
 
         assert response.status_code == 404
         assert "File not found" in response.json()["detail"]
@@ -200,22 +223,22 @@ class TestFileRoutes:
         """Test successful file deletion."""
         # Upload a file
         files = {"file": ("delete_test.txt", b"Delete me", "text/plain")}
-        upload_response = client.post(f"{settings.API_PREFIX}/files/", files=files)
+        upload_response = client.post(FILES_URL, files=files)
         assert upload_response.status_code == 201
         file_id = upload_response.json()["id"]
 
         # Delete the file
-        delete_response = client.delete(f"{settings.API_PREFIX}/files/{file_id}")
+        delete_response = client.delete(f"{FILES_URL}{file_id}")
         assert delete_response.status_code == 200
         assert delete_response.json()["message"] == "File deleted successfully"
 
         # Verify file is gone
-        download_response = client.get(f"{settings.API_PREFIX}/files/{file_id}")
-        assert download_response.status_code == 404
+        with client.stream("GET", f"{FILES_URL}{file_id}") as download_response:
+            assert download_response.status_code == 404
 
     def test_delete_file_not_found(self, client):
         """Test deleting non-existent file."""
-        response = client.delete(f"{settings.API_PREFIX}/files/non-existent-id")
+        response = client.delete(f"{FILES_URL}non-existent-id")
         assert response.status_code == 404
         assert "File not found" in response.json()["detail"]
 
@@ -230,11 +253,11 @@ class TestFileRoutes:
 
         for filename, content, content_type in test_files:
             files = {"file": (filename, content, content_type)}
-            response = client.post(f"{settings.API_PREFIX}/files/", files=files)
+            response = client.post(FILES_URL, files=files)
             assert response.status_code == 201
 
         # Get stats
-        response = client.get(f"{settings.API_PREFIX}/files/stats/summary")
+        response = client.get(f"{FILES_URL}stats/summary")
         assert response.status_code == 200
 
         data = response.json()
@@ -243,75 +266,70 @@ class TestFileRoutes:
         assert "max_file_size" in data
         assert "storage_path" in data
 
-    def test_file_with_special_characters(self, client):
-        """Test handling files with special characters in filename."""
-        special_names = [
+    @pytest.mark.parametrize(
+        "filename",
+        [
             "file with spaces.txt",
             "file-with-dashes.txt",
             "file_with_underscores.txt",
             "fiлe_with_unicode.txt",
             "file@special#chars.txt",
-        ]
-
-        for filename in special_names:
-            files = {"file": (filename, b"Content", "text/plain")}
-            response = client.post(f"{settings.API_PREFIX}/files/", files=files)
-            assert response.status_code == 201
+        ],
+    )
+    def test_file_with_special_characters(self, client, filename):
+        """Test handling files with special characters in filename."""
+        files = {"file": (filename, b"Content", "text/plain")}
+        response = client.post(FILES_URL, files=files)
+        assert response.status_code == 201
 
-            # Verify sanitized filename
-            data = response.json()
-            assert data["filename"]  # Should have a filename
-            assert ".." not in data["filename"]  # No path traversal
+        # Verify sanitized filename
+        data = response.json()
+        assert data["filename"]  # Should have a filename
+        assert ".." not in data["filename"]  # No path traversal
 
-    def test_concurrent_file_operations(self, client):
+    @pytest.mark.asyncio
+    async def test_concurrent_file_operations(self, async_client):
         """Test handling concurrent file operations."""
-        import concurrent.futures
-
-        def upload_file(index):
-            files = {
-                "file": (
-                    f"concurrent_{index}.txt",
-                    f"Content {index}".encode(),
-                    "text/plain",
-                )
-            }
-            return client.post(f"{settings.API_PREFIX}/files/", files=files)
+        uploads = [
+            async_client.post(
+                FILES_URL,
+                files={
+                    "file": (
+                        f"concurrent_{index}.txt",
+                        f"Content {index}".encode(),
+                        "text/plain",
+                    )
+                },
+            )
+            for index in range(10)
+        ]
 
         # Upload files concurrently
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            futures = [executor.submit(upload_file, i) for i in range(10)]
-            responses = [
-                future.result() for future in concurrent.futures.as_completed(futures)
-            ]
+        responses = await asyncio.gather(*uploads)
 
         # All uploads should succeed
         assert all(response.status_code == 201 for response in responses)
 
         # Verify all files exist
-        list_response = client.get(f"{settings.API_PREFIX}/files/")
+        list_response = await async_client.get(FILES_URL)
         assert list_response.status_code == 200
         assert list_response.json()["total"] == 10
 
-    def test_api_documentation(self, client):
+    def test_api_documentation(self, client, openapi_schema):
         """Test that API documentation is accessible."""
         response = client.get("/docs")
         assert response.status_code == 200
 
-        # Check that file endpoints are documented
-        response = client.get("/openapi.json")
-        assert response.status_code == 200
-        openapi = response.json()
-
         # Verify file endpoints exist in the API spec
-        paths = openapi["paths"]
-        assert f"{settings.API_PREFIX}/files/" in paths
-        assert f"{settings.API_PREFIX}/files/{{file_id}}" in paths
-        assert f"{settings.API_PREFIX}/files/stats/summary" in paths
+        paths = openapi_schema["paths"]
+        assert FILES_URL in paths
+        assert f"{FILES_URL}{{file_id}}" in paths
+        assert f"{FILES_URL}stats/summary" in paths
 
     def test_upload_returns_syft_url(self, client):
         """Test that syft_url is included in upload response when syft_core is enabled."""
-        files = {"file": ("test.txt", b"Test content", "text/plain")}
-        response = client.post(f"{settings.API_PREFIX}/files/", files=files)
+        files = {"file": TEST_TXT}
+        response = client.post(FILES_URL, files=files)
 
         assert response.status_code == 201
         data = response.json()
@@ -322,12 +340,12 @@ class TestFileRoutes:
     def test_list_files_includes_syft_url(self, client):
         """Test that file list includes syft_url when syft_core is enabled."""
         # Upload a file
-        files = {"file": ("test.txt", b"Test content", "text/plain")}
-        upload_response = client.post(f"{settings.API_PREFIX}/files/", files=files)
+        files = {"file": TEST_TXT}
+        upload_response = client.post(FILES_URL, files=files)
         assert upload_response.status_code == 201
 
         # List files
-        list_response = client.get(f"{settings.API_PREFIX}/files/")
+        list_response = client.get(FILES_URL)
         assert list_response.status_code == 200
 
         data = list_response.json()
@@ -341,15 +359,13 @@ class TestFileRoutes:
         """Test that update response includes syft_url when syft_core is enabled."""
         # Upload original file
         files = {"file": ("original.txt", b"Original content", "text/plain")}
-        upload_response = client.post(f"{settings.API_PREFIX}/files/", files=files)
+        upload_response = client.post(FILES_URL, files=files)
         assert upload_response.status_code == 201
         file_id = upload_response.json()["id"]
 
         # Update file
         new_files = {"file": ("updated.txt", b"Updated content", "text/plain")}
-        update_response = client.put(
-            f"{settings.API_PREFIX}/files/{file_id}", files=new_files
-        )
+        update_response = client.put(f"{FILES_URL}{file_id}", files=new_files)
 
         assert update_response.status_code == 200
         data = update_response.json()
@@ -357,94 +373,29 @@ class TestFileRoutes:
         assert data["syft_url"] is not None
         assert "updated.txt" in data["syft_url"]
 
-    def test_internal_server_error_upload(self, client, monkeypatch):
-        """Test 500 error handling during upload."""
-
-        def mock_save_file(*args, **kwargs):
-            raise Exception("Unexpected database error")
-
-        monkeypatch.setattr(
-            "app.services.file_service.FileService.save_file", mock_save_file
-        )
-
-        files = {"file": ("test.txt", b"Test content", "text/plain")}
-        response = client.post(f"{settings.API_PREFIX}/files/", files=files)
-
-        assert response.status_code == 500
-        assert "Internal server error" in response.json()["detail"]
-
-    def test_internal_server_error_list(self, client, monkeypatch):
-        """Test 500 error handling during file listing."""
-
-        def mock_list_files(*args, **kwargs):
-            raise Exception("Database connection failed")
-
-        monkeypatch.setattr(
-            "app.services.file_service.FileService.list_files", mock_list_files
-        )
-
-        response = client.get(f"{settings.API_PREFIX}/files/")
-
-        assert response.status_code == 500
-        assert "Internal server error" in response.json()["detail"]
-
-    def test_internal_server_error_download(self, client, monkeypatch):
-        """Test 500 error handling during download."""
-
-        def mock_get_file(*args, **kwargs):
-            raise Exception("File system error")
-
-        monkeypatch.setattr(
-            "app.services.file_service.FileService.get_file", mock_get_file
-        )
-
-        response = client.get(f"{settings.API_PREFIX}/files/test-id")
-
-        assert response.status_code == 500
-        assert "Internal server error" in response.json()["detail"]
-
-    def test_internal_server_error_update(self, client, monkeypatch):
-        """Test 500 error handling during update."""
-
-        def mock_update_file(*args, **kwargs):
-            raise Exception("Permission denied")
-
-        monkeypatch.setattr(
-            "app.services.file_service.FileService.update_file", mock_update_file
-        )
-
-        files = {"file": ("test.txt", b"Test content", "text/plain")}
-        response = client.put(f"{settings.API_PREFIX}/files/test-id", files=files)
-
-        assert response.status_code == 500
-        assert "Internal server error" in response.json()["detail"]
-
-    def test_internal_server_error_delete(self, client, monkeypatch):
-        """Test 500 error handling during deletion."""
-
-        def mock_delete_file(*args, **kwargs):
-            raise Exception("File locked")
-
-        monkeypatch.setattr(
-            "app.services.file_service.FileService.delete_file", mock_delete_file
-        )
-
-        response = client.delete(f"{settings.API_PREFIX}/files/test-id")
-
-        assert response.status_code == 500
-        assert "Internal server error" in response.json()["detail"]
-
-    def test_internal_server_error_stats(self, client, monkeypatch):
-        """Test 500 error handling for storage stats."""
-
-        def mock_get_stats(*args, **kwargs):
-            raise Exception("Stats calculation failed")
-
-        monkeypatch.setattr(
-            "app.services.file_service.FileService.get_storage_stats", mock_get_stats
-        )
-
-        response = client.get(f"{settings.API_PREFIX}/files/stats/summary")
+    @pytest.mark.parametrize(
+        "method,path,svc_method,with_file",
+        [
+            ("post", "/files/", "save_file", True),
+            ("get", "/files/", "list_files", False),
+            ("get", "/files/test-id", "get_file", False),
+            ("put", "/files/test-id", "update_file", True),
+            ("delete", "/files/test-id", "delete_file", False),
+            ("get", "/files/stats/summary", "get_storage_stats", False),
+        ],
+    )
+    def test_internal_server_error(self, client, method, path, svc_method, with_file):
+        """Test 500 error handling when the file service fails unexpectedly."""
+
+        async def fail(*args, **kwargs):
+            raise Exception("Unexpected storage error")
+
+        # Swap in a stub service so no real storage is touched
+        failing_service = SimpleNamespace(**{svc_method: fail})
+        app.dependency_overrides[get_file_service] = lambda: failing_service
+
+        files = {"file": TEST_TXT} if with_file else None
+        response = client.request(method, f"{settings.API_PREFIX}{path}", files=files)
 
         assert response.status_code == 500
         assert "Internal server error" in response.json()["detail"]
@@ -1,23 +1,52 @@
 """Tests for permission management endpoints."""
 
+import pytest
 from fastapi.testclient import TestClient
 
 from app.config import settings
+from app.main import app
+from app.services.file_service import get_storage_backend
+
+FILES_URL = f"{settings.API_PREFIX}/files/"
+PERMS_URL = f"{settings.API_PREFIX}/permissions"
+TEST_TXT = ("test.txt", b"Test content", "text/plain")
+
+
+@pytest.fixture(autouse=True)
+def cleanup_test_storage(module_test_storage):
+    """Keep storage for the whole module so shared uploads survive."""
+    yield
+
+
+@pytest.fixture(scope="module")
+def uploaded_file_id(client: TestClient, module_test_storage):
+    """Upload ``test.txt`` once and share its ID across read-only tests."""
+    files = {"file": TEST_TXT}
+    upload_resp = client.post(FILES_URL, files=files)
+    assert upload_resp.status_code == 201
+    return upload_resp.json()["id"]
+
+
+@pytest.fixture
+def owned_file_id(client: TestClient):
+    """Upload a file for a test that mutates its permissions, then delete it."""
+    files = {"file": TEST_TXT}
+    upload_resp = client.post(FILES_URL, files=files)
+    assert upload_resp.status_code == 201
+    file_id = upload_resp.json()["id"]
+
+    yield file_id
+
+    client.delete(f"{FILES_URL}{file_id}")
 
 
 class TestPermissionRoutes:
     """Test cases for permission management endpoints."""
 
-    def test_get_file_permissions(self, client: TestClient):
+    def test_get_file_permissions(self, client: TestClient, uploaded_file_id: str):
         """Test retrieving permissions for a file."""
-        # First upload a file
-        files = {"file": ("test.txt", b"Test content", "text/plain")}
-        upload_resp = client.post(f"{settings.API_PREFIX}/files/", files=files)
-        assert upload_resp.status_code == 201
-        file_id = upload_resp.json()["id"]
-
         # Get permissions
-        response = client.get(f"{settings.API_PREFIX}/files/{file_id}/permissions")
+        response = client.get(f"{FILES_URL}{uploaded_file_id}/permissions")
         assert response.status_code == 200
 
         data = response.json()
@@ -37,18 +66,12 @@ class TestPermissionRoutes:
         assert owner_rule is not None
         assert set(owner_rule["permissions"]) == {"READ", "WRITE", "CREATE", "ADMIN"}
 
-    def test_grant_permission(self, client: TestClient):
+    def test_grant_permission(self, client: TestClient, owned_file_id: str):
         """Test granting permissions to another user."""
-        # Upload a file
-        files = {"file": ("test.txt", b"Test content", "text/plain")}
-        upload_resp = client.post(f"{settings.API_PREFIX}/files/", files=files)
-        assert upload_resp.status_code == 201
-        file_id = upload_resp.json()["id"]
-
         # Grant read permission to another user
         permission_request = {"user": "colleague@example.com", "permissions": ["READ"]}
         response = client.post(
-            f"{settings.API_PREFIX}/files/{file_id}/permissions",
+            f"{FILES_URL}{owned_file_id}/permissions",
             json=permission_request,
         )
         assert response.status_code == 200
@@ -59,7 +82,7 @@ class TestPermissionRoutes:
         assert "id" in data
 
         # Verify permission was added
-        perms_resp = client.get(f"{settings.API_PREFIX}/files/{file_id}/permissions")
+        perms_resp = client.get(f"{FILES_URL}{owned_file_id}/permissions")
         assert perms_resp.status_code == 200
         permissions = perms_resp.json()["permissions"]
 
@@ -69,52 +92,39 @@ class TestPermissionRoutes:
         assert colleague_perm is not None
         assert colleague_perm["permissions"] == ["READ"]
 
-    def test_grant_multiple_permissions(self, client: TestClient):
+    def test_grant_multiple_permissions(self, client: TestClient, owned_file_id: str):
         """Test granting multiple permissions."""
-        # Upload a file
-        files = {"file": ("test.txt", b"Test content", "text/plain")}
-        upload_resp = client.post(f"{settings.API_PREFIX}/files/", files=files)
-        file_id = upload_resp.json()["id"]
-
         # Grant read and write permissions
         permission_request = {
             "user": "editor@example.com",
             "permissions": ["READ", "WRITE"],
         }
         response = client.post(
-            f"{settings.API_PREFIX}/files/{file_id}/permissions",
+            f"{FILES_URL}{owned_file_id}/permissions",
             json=permission_request,
         )
         assert response.status_code == 200
         assert set(response.json()["permissions"]) == {"READ", "WRITE"}
 
-    def test_grant_permission_wildcard_user(self, client: TestClient):
+    def test_grant_permission_wildcard_user(
+        self, client: TestClient, owned_file_id: str
+    ):
         """Test granting permissions to all users (*)."""
-        # Upload a file
-        files = {"file": ("public.txt", b"Public content", "text/plain")}
-        upload_resp = client.post(f"{settings.API_PREFIX}/files/", files=files)
-        file_id = upload_resp.json()["id"]
-
         # Grant read permission to everyone
         permission_request = {"user": "*", "permissions": ["READ"]}
         response = client.post(
-            f"{settings.API_PREFIX}/files/{file_id}/permissions",
+            f"{FILES_URL}{owned_file_id}/permissions",
             json=permission_request,
         )
         assert response.status_code == 200
         assert response.json()["user"] == "*"
 
-    def test_update_permission(self, client: TestClient):
+    def test_update_permission(self, client: TestClient, owned_file_id: str):
         """Test updating an existing permission."""
-        # Upload a file and grant permission
-        files = {"file": ("test.txt", b"Test content", "text/plain")}
-        upload_resp = client.post(f"{settings.API_PREFIX}/files/", files=files)
-        file_id = upload_resp.json()["id"]
-
         # Grant initial permission
         permission_request = {"user": "user@example.com", "permissions": ["READ"]}
         grant_resp = client.post(
-            f"{settings.API_PREFIX}/files/{file_id}/permissions",
+            f"{FILES_URL}{owned_file_id}/permissions",
             json=permission_request,
         )
         permission_id = grant_resp.json()["id"]
@@ -122,36 +132,31 @@ class TestPermissionRoutes:
         # Update to add write permission
         update_request = {"permissions": ["READ", "WRITE"]}
         response = client.put(
-            f"{settings.API_PREFIX}/files/{file_id}/permissions/{permission_id}",
+            f"{FILES_URL}{owned_file_id}/permissions/{permission_id}",
             json=update_request,
         )
         assert response.status_code == 200
         assert set(response.json()["permissions"]) == {"READ", "WRITE"}
 
-    def test_revoke_permission(self, client: TestClient):
+    def test_revoke_permission(self, client: TestClient, owned_file_id: str):
         """Test revoking a permission."""
-        # Upload a file and grant permission
-        files = {"file": ("test.txt", b"Test content", "text/plain")}
-        upload_resp = client.post(f"{settings.API_PREFIX}/files/", files=files)
-        file_id = upload_resp.json()["id"]
-
         # Grant permission
         permission_request = {"user": "temp@example.com", "permissions": ["READ"]}
         grant_resp = client.post(
-            f"{settings.API_PREFIX}/files/{file_id}/permissions",
+            f"{FILES_URL}{owned_file_id}/permissions",
             json=permission_request,
         )
         permission_id = grant_resp.json()["id"]
 
         # Revoke permission
         response = client.delete(
-            f"{settings.API_PREFIX}/files/{file_id}/permissions/{permission_id}"
+            f"{FILES_URL}{owned_file_id}/permissions/{permission_id}"
         )
         assert response.status_code == 200
         assert response.json()["message"] == "Permission revoked successfully"
 
         # Verify permission was removed
-        perms_resp = client.get(f"{settings.API_PREFIX}/files/{file_id}/permissions")
+        perms_resp = client.get(f"{FILES_URL}{owned_file_id}/permissions")
         permissions = perms_resp.json()["permissions"]
 
         temp_perm = next(
@@ -170,7 +175,7 @@ class TestPermissionRoutes:
 
         for filename, content, content_type in csv_files:
             files = {"file": (filename, content, content_type)}
-            response = client.post(f"{settings.API_PREFIX}/files/", files=files)
+            response = client.post(FILES_URL, files=files)
             assert response.status_code == 201
 
         # Apply bulk permissions to CSV files
@@ -180,9 +185,7 @@ class TestPermissionRoutes:
             "path_pattern": "*.csv",
             "recursive": False,
         }
-        response = client.post(
-            f"{settings.API_PREFIX}/permissions/bulk", json=bulk_request
-        )
+        response = client.post(f"{PERMS_URL}/bulk", json=bulk_request)
         assert response.status_code == 200
 
         data = response.json()
@@ -190,17 +193,16 @@ class TestPermissionRoutes:
         # Note: In test environment, files are stored with UUID prefixes
         # so the pattern matching might not work as expected
 
-    def test_check_permission(self, client: TestClient):
+    def test_check_permission(self, client: TestClient, uploaded_file_id: str):
         """Test checking if a user has specific permission."""
-        # Upload a file
-        files = {"file": ("test.txt", b"Test content", "text/plain")}
-        upload_resp = client.post(f"{settings.API_PREFIX}/files/", files=files)
-        file_id = upload_resp.json()["id"]
-
         # Check owner permission
         response = client.get(
-            f"{settings.API_PREFIX}/permissions/check",
-            params={"file_id": file_id, "user": "dev@test.local", "permission": "READ"},
+            f"{PERMS_URL}/check",
+            params={
+                "file_id": uploaded_file_id,
+                "user": "dev@test.local",
+                "permission": "READ",
+            },
         )
         assert response.status_code == 200
         data = response.json()
@@ -208,9 +210,9 @@ class TestPermissionRoutes:
 
         # Check non-owner permission (should be false)
         response = client.get(
-            f"{settings.API_PREFIX}/permissions/check",
+            f"{PERMS_URL}/check",
             params={
-                "file_id": file_id,
+                "file_id": uploaded_file_id,
                 "user": "other@example.com",
                 "permission": "WRITE",
             },
@@ -218,58 +220,41 @@ class TestPermissionRoutes:
         assert response.status_code == 200
         assert response.json()["has_permission"] is False
 
-    def test_invalid_permission_type(self, client: TestClient):
+    def test_invalid_permission_type(self, client: TestClient, uploaded_file_id: str):
         """Test granting invalid permission type."""
-        # Upload a file
-        files = {"file": ("test.txt", b"Test content", "text/plain")}
-        upload_resp = client.post(f"{settings.API_PREFIX}/files/", files=files)
-        file_id = upload_resp.json()["id"]
-
         # Try to grant invalid permission
         permission_request = {"user": "user@example.com", "permissions": ["INVALID"]}
         response = client.post(
-            f"{settings.API_PREFIX}/files/{file_id}/permissions",
+            f"{FILES_URL}{uploaded_file_id}/permissions",
             json=permission_request,
         )
         assert response.status_code == 422
         assert "Invalid permission" in response.json()["detail"][0]["msg"]
 
-    def test_invalid_email(self, client: TestClient):
+    def test_invalid_email(self, client: TestClient, uploaded_file_id: str):
         """Test granting permission with invalid email."""
-        # Upload a file
-        files = {"file": ("test.txt", b"Test content", "text/plain")}
-        upload_resp = client.post(f"{settings.API_PREFIX}/files/", files=files)
-        file_id = upload_resp.json()["id"]
-
         # Try to grant permission with invalid email
         permission_request = {"user": "not-an-email", "permissions": ["READ"]}
         response = client.post(
-            f"{settings.API_PREFIX}/files/{file_id}/permissions",
+            f"{FILES_URL}{uploaded_file_id}/permissions",
             json=permission_request,
         )
         assert response.status_code == 422
         assert "Invalid email address" in response.json()["detail"][0]["msg"]
 
-    def test_permission_not_found(self, client: TestClient):
+    def test_permission_not_found(self, client: TestClient, uploaded_file_id: str):
         """Test updating/deleting non-existent permission."""
-        # Upload a file
-        files = {"file": ("test.txt", b"Test content", "text/plain")}
-        upload_resp = client.post(f"{settings.API_PREFIX}/files/", files=files)
-        file_id = upload_resp.json()["id"]
-
         # Try to update non-existent permission
         update_request = {"permissions": ["READ"]}
         response = client.put(
-            f"{settings.API_PREFIX}/files/{file_id}/permissions/fake-id",
+            f"{FILES_URL}{uploaded_file_id}/permissions/fake-id",
             json=update_request,
         )
         assert response.status_code == 404
         assert "Permission rule not found" in response.json()["detail"]
 
         # Try to delete non-existent permission
-        response = client.delete(
-            f"{settings.API_PREFIX}/files/{file_id}/permissions/fake-id"
-        )
+        response = client.delete(f"{FILES_URL}{uploaded_file_id}/permissions/fake-id")
         assert response.status_code == 404
         assert "Permission rule not found" in response.json()["detail"]
 
@@ -278,13 +263,39 @@ class TestPermissionRoutes:
         fake_file_id = "non-existent-file-id"
 
         # Try to get permissions
-        response = client.get(f"{settings.API_PREFIX}/files/{fake_file_id}/permissions")
+        response = client.get(f"{FILES_URL}{fake_file_id}/permissions")
         assert response.status_code == 404
 
         # Try to grant permission
         permission_request = {"user": "user@example.com", "permissions": ["READ"]}
         response = client.post(
-            f"{settings.API_PREFIX}/files/{fake_file_id}/permissions",
+            f"{FILES_URL}{fake_file_id}/permissions",
             json=permission_request,
         )
         assert response.status_code == 404
+
+    def test_permissions_use_injected_storage_backend(
+        self, client: TestClient, memory_backend
+    ):
+        """Test that permission routes read metadata through the storage backend."""
+        app.dependency_overrides[get_storage_backend] = lambda: memory_backend
+        try:
+            upload_resp = client.post(FILES_URL, files={"file": TEST_TXT})
+            assert upload_resp.status_code == 201
+            file_id = upload_resp.json()["id"]
+
+            response = client.get(f"{FILES_URL}{file_id}/permissions")
+            assert response.status_code == 200
+
+            response = client.get(
+                f"{PERMS_URL}/check",
+                params={
+                    "file_id": file_id,
+                    "user": "dev@test.local",
+                    "permission": "READ",
+                },
+            )
+            assert response.status_code == 200
+            assert response.json()["has_permission"] is True
+        finally:
+            del app.dependency_overrides[get_storage_backend]
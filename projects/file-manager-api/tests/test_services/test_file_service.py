@@ -1,42 +1,31 @@
-import shutil
-import tempfile
 from datetime import datetime
 from io import BytesIO
-from pathlib import Path
 
 import pytest
+import pytest_asyncio
 from fastapi import HTTPException
 
+from app.config import MockSyftClient, StoragePaths, settings
 from app.services.file_service import FileService
+from app.utils.file_utils import calculate_file_hash, sanitize_filename
 
 
 @pytest.fixture
-def temp_storage_dir():
-    """Create a temporary directory for file storage during tests."""
-    temp_dir = tempfile.mkdtemp()
-    yield temp_dir
-    # Cleanup after test
-    shutil.rmtree(temp_dir)
+def file_service(tmp_path, ensure_syft_client):
+    """Create a FileService storing into this test's temporary directory."""
+    return FileService(
+        StoragePaths(storage=tmp_path / "storage", metadata=tmp_path / "metadata")
+    )
 
 
-@pytest.fixture
-def file_service(temp_storage_dir, monkeypatch, ensure_syft_client):
-    """Create a FileService instance with temporary storage."""
-    # Mock the syft_core paths
-    storage_path = Path(temp_storage_dir) / "storage"
-    metadata_path = Path(temp_storage_dir) / "metadata"
-
-    monkeypatch.setattr("app.config.FILE_STORAGE_PATH", storage_path)
-    monkeypatch.setattr("app.config.METADATA_PATH", metadata_path)
-
-    # Also patch in the service module
-    monkeypatch.setattr("app.services.file_service.FILE_STORAGE_PATH", storage_path)
-    monkeypatch.setattr("app.services.file_service.METADATA_PATH", metadata_path)
+def metadata_file_path(service, file_id):
+    """Expected location of a file's metadata JSON."""
+    return service.metadata_path / f"{file_id}.json"
 
-    # Ensure syft_client is available via fixture
-    monkeypatch.setattr("app.services.file_service.syft_client", ensure_syft_client)
 
-    return FileService()
+def assert_file_contents(path, content):
+    """Assert a file holds content; a missing file raises FileNotFoundError."""
+    assert path.read_bytes() == content
 
 
 class MockUploadFile:
@@ -64,10 +53,44 @@ def mock_upload_file():
     return _create_upload_file
 
 
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def three_uploaded_files(tmp_path_factory):
+    """Upload three files once into a dedicated FileService for the module.
+
+    Returns the service and the uploads' metadata. Tests using it must only
+    read from the service.
+    """
+    root = tmp_path_factory.mktemp("three-files")
+    service = FileService(
+        StoragePaths(storage=root / "storage", metadata=root / "metadata")
+    )
+    files_data = [
+        ("file1.txt", b"A" * 100, "text/plain"),
+        ("file2.pdf", b"B" * 200, "application/pdf"),
+        ("file3.jpg", b"C" * 300, "image/jpeg"),
+    ]
+
+    # Module-scoped, so patch with a context instead of the monkeypatch fixture
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(
+            "app.services.file_service.syft_client",
+            MockSyftClient("test@example.com"),
+        )
+        uploaded = [
+            await service.save_file(
+                MockUploadFile(filename, BytesIO(content), content_type, len(content))
+            )
+            for filename, content, content_type in files_data
+        ]
+
+    return service, uploaded
+
+
+# Run every test in the class on one module-scoped event loop
+@pytest.mark.asyncio(loop_scope="module")
 class TestFileService:
     """Test cases for FileService."""
 
-    @pytest.mark.asyncio
     async def test_save_file_success(self, file_service, mock_upload_file):
         """Test successful file upload."""
         upload_file = mock_upload_file()
@@ -83,77 +106,90 @@ class TestFileService:
 
         # Verify file exists on disk
         file_path = file_service.storage_path / f"{metadata.id}_test.txt"
-        assert file_path.exists()
-        assert file_path.read_text() == "Test file content"
+        assert_file_contents(file_path, b"Test file content")
+        assert metadata.checksum == calculate_file_hash(file_path)
 
         # Verify metadata exists
-        metadata_path = file_service._get_metadata_file_path(metadata.id)
+        metadata_path = metadata_file_path(file_service, metadata.id)
         assert metadata_path.exists()
 
-    @pytest.mark.asyncio
-    async def test_save_file_size_limit(
-        self, file_service, mock_upload_file, monkeypatch
+    @pytest.mark.parametrize("fsync_on_write,expected_syncs", [(True, 2), (False, 0)])
+    async def test_save_file_fsync_setting(
+        self,
+        file_service,
+        mock_upload_file,
+        monkeypatch,
+        fsync_on_write,
+        expected_syncs,
     ):
-        """Test file size limit validation."""
-        # Need to patch the settings in the file_utils module where it's used
-        monkeypatch.setattr(
-            "app.utils.file_utils.settings.MAX_FILE_SIZE", 10
-        )  # 10 bytes limit
-
-        upload_file = mock_upload_file(content=b"This content is too large")
+        """Test that file and metadata writes are fsynced only when enabled."""
+        synced = []
+        config = settings.model_copy(update={"FSYNC_ON_WRITE": fsync_on_write})
+        service = FileService(file_service.paths, config=config)
+        monkeypatch.setattr("app.services.file_service.os.fsync", synced.append)
+
+        await service.save_file(mock_upload_file())
+
+        assert len(synced) == expected_syncs
+
+    @pytest.mark.parametrize(
+        "case,status_code,detail",
+        [
+            ("size_limit", 413, "exceeds maximum allowed size"),
+            ("invalid_type", 415, "File type not allowed"),
+            ("get_missing", 404, "File not found"),
+            ("update_missing", 404, "File not found"),
+            ("delete_missing", 404, "File not found"),
+        ],
+    )
+    async def test_error_responses(
+        self,
+        file_service,
+        mock_upload_file,
+        settings_override,
+        case,
+        status_code,
+        detail,
+    ):
+        """Test that rejected uploads and unknown file IDs raise HTTP errors."""
+        settings_patches = {
+            "size_limit": {"MAX_FILE_SIZE": 10},
+            "invalid_type": {
+                "ALLOWED_MIME_TYPES": {"image/jpeg"},
+                "ALLOWED_EXTENSIONS": {".jpg", ".jpeg"},
+            },
+        }
+        settings_override(**settings_patches.get(case, {}))
+
+        calls = {
+            "size_limit": lambda: file_service.save_file(
+                mock_upload_file(content=b"This content is too large")
+            ),
+            "invalid_type": lambda: file_service.save_file(
+                mock_upload_file(filename="test.txt", content_type="text/plain")
+            ),
+            "get_missing": lambda: file_service.get_file("non-existent-id"),
+            "update_missing": lambda: file_service.update_file(
+                "non-existent-id", mock_upload_file()
+            ),
+            "delete_missing": lambda: file_service.delete_file("non-existent-id"),
+        }
 
         with pytest.raises(HTTPException) as exc_info:
-            await file_service.save_file(upload_file)
-
-        assert exc_info.value.status_code == 413
-        assert "exceeds maximum allowed size" in str(exc_info.value.detail)
+            await calls[case]()
 
-    @pytest.mark.asyncio
-    async def test_save_file_invalid_type(
-        self, file_service, mock_upload_file, monkeypatch
-    ):
-        """Test file type validation."""
-        # Restrict allowed types - patch in file_utils where they're used
-        monkeypatch.setattr(
-            "app.utils.file_utils.settings.ALLOWED_MIME_TYPES", {"image/jpeg"}
-        )
-        monkeypatch.setattr(
-            "app.utils.file_utils.settings.ALLOWED_EXTENSIONS", {".jpg", ".jpeg"}
-        )
+        assert exc_info.value.status_code == status_code
+        assert detail in str(exc_info.value.detail)
 
-        upload_file = mock_upload_file(filename="test.txt", content_type="text/plain")
+    async def test_save_file_sanitizes_filename(self, file_service, mock_upload_file):
+        """Test that uploads are stored under the sanitized filename."""
+        upload_file = mock_upload_file(filename="../../../etc/passwd.txt")
 
-        with pytest.raises(HTTPException) as exc_info:
-            await file_service.save_file(upload_file)
-
-        assert exc_info.value.status_code == 415
-        assert "File type not allowed" in str(exc_info.value.detail)
-
-    @pytest.mark.asyncio
-    async def test_sanitize_dangerous_filename(self, file_service, mock_upload_file):
-        """Test filename sanitization for dangerous filenames."""
-        dangerous_names = [
-            ("../../../etc/passwd.txt", "passwd.txt"),
-            ("..\\..\\windows\\system32\\config\\sam.txt", "sam.txt"),
-            ("file<script>.txt", "filescript.txt"),
-            ("file|pipe.txt", "filepipe.txt"),
-            ("file:colon.txt", "filecolon.txt"),
-        ]
-
-        for dangerous_name, expected_safe in dangerous_names:
-            upload_file = mock_upload_file(filename=dangerous_name)
-            metadata = await file_service.save_file(upload_file)
+        metadata = await file_service.save_file(upload_file)
 
-            # Verify filename was sanitized
-            assert ".." not in metadata.filename
-            assert "<" not in metadata.filename
-            assert ">" not in metadata.filename
-            assert "|" not in metadata.filename
-            assert ":" not in metadata.filename
-            # Check that extension is preserved
-            assert metadata.filename.endswith(".txt")
+        assert metadata.filename == "passwd.txt"
+        assert metadata.original_filename == "../../../etc/passwd.txt"
 
-    @pytest.mark.asyncio
     async def test_get_file_success(self, file_service, mock_upload_file):
         """Test successful file retrieval."""
         # First upload a file
@@ -163,44 +199,21 @@ class TestFileService:
         # Then retrieve it
         file_path, retrieved_metadata = await file_service.get_file(metadata.id)
 
-        assert file_path.exists()
         assert retrieved_metadata.id == metadata.id
         assert retrieved_metadata.filename == metadata.filename
-        assert file_path.read_text() == "Test file content"
-
-    @pytest.mark.asyncio
-    async def test_get_file_not_found(self, file_service):
-        """Test retrieving non-existent file."""
-        with pytest.raises(HTTPException) as exc_info:
-            await file_service.get_file("non-existent-id")
+        assert_file_contents(file_path, b"Test file content")
 
-        assert exc_info.value.status_code == 404
-        assert "File not found" in str(exc_info.value.detail)
-
-    @pytest.mark.asyncio
-    async def test_list_files(self, file_service, mock_upload_file):
+    async def test_list_files(self, three_uploaded_files):
         """Test listing all files."""
-        # Upload multiple files
-        files_data = [
-            ("file1.txt", b"Content 1", "text/plain"),
-            ("file2.pdf", b"Content 2", "application/pdf"),
-            ("file3.jpg", b"Content 3", "image/jpeg"),
-        ]
+        service, uploaded = three_uploaded_files
+        uploaded_ids = {metadata.id for metadata in uploaded}
 
-        uploaded_ids = []
-        for filename, content, content_type in files_data:
-            upload_file = mock_upload_file(filename, content, content_type)
-            metadata = await file_service.save_file(upload_file)
-            uploaded_ids.append(metadata.id)
-
-        # List files
-        files = await file_service.list_files()
+        files = await service.list_files()
 
         assert len(files) == 3
         assert all(file.id in uploaded_ids for file in files)
         assert files[0].upload_date >= files[1].upload_date  # Sorted by date desc
 
-    @pytest.mark.asyncio
     async def test_update_file_success(self, file_service, mock_upload_file):
         """Test successful file update."""
         # Upload original file
@@ -219,25 +232,13 @@ class TestFileService:
 
         # Verify new content
         file_path = file_service.storage_path / f"{original_id}_updated.txt"
-        assert file_path.exists()
-        assert file_path.read_text() == "Updated content"
+        assert_file_contents(file_path, b"Updated content")
+        assert updated_metadata.checksum == calculate_file_hash(file_path)
 
         # Verify old file is removed
         old_path = file_service.storage_path / f"{original_id}_original.txt"
         assert not old_path.exists()
 
-    @pytest.mark.asyncio
-    async def test_update_file_not_found(self, file_service, mock_upload_file):
-        """Test updating non-existent file."""
-        new_file = mock_upload_file()
-
-        with pytest.raises(HTTPException) as exc_info:
-            await file_service.update_file("non-existent-id", new_file)
-
-        assert exc_info.value.status_code == 404
-        assert "File not found" in str(exc_info.value.detail)
-
-    @pytest.mark.asyncio
     async def test_delete_file_success(self, file_service, mock_upload_file):
         """Test successful file deletion."""
         # Upload a file
@@ -247,7 +248,7 @@ class TestFileService:
 
         # Verify file exists
         file_path = file_service.storage_path / f"{file_id}_test.txt"
-        metadata_path = file_service._get_metadata_file_path(file_id)
+        metadata_path = metadata_file_path(file_service, file_id)
         assert file_path.exists()
         assert metadata_path.exists()
 
@@ -259,38 +260,17 @@ class TestFileService:
         assert not file_path.exists()
         assert not metadata_path.exists()
 
-    @pytest.mark.asyncio
-    async def test_delete_file_not_found(self, file_service):
-        """Test deleting non-existent file."""
-        with pytest.raises(HTTPException) as exc_info:
-            await file_service.delete_file("non-existent-id")
-
-        assert exc_info.value.status_code == 404
-        assert "File not found" in str(exc_info.value.detail)
-
-    @pytest.mark.asyncio
-    async def test_get_storage_stats(self, file_service, mock_upload_file):
+    async def test_get_storage_stats(self, three_uploaded_files):
         """Test storage statistics."""
-        # Upload some files
-        files_data = [
-            ("file1.txt", b"A" * 100),  # 100 bytes
-            ("file2.txt", b"B" * 200),  # 200 bytes
-            ("file3.txt", b"C" * 300),  # 300 bytes
-        ]
+        service, _ = three_uploaded_files
 
-        for filename, content in files_data:
-            upload_file = mock_upload_file(filename, content)
-            await file_service.save_file(upload_file)
-
-        # Get stats
-        stats = await file_service.get_storage_stats()
+        stats = await service.get_storage_stats()
 
         assert stats["total_files"] == 3
         assert stats["total_size"] == 600  # 100 + 200 + 300
         assert "max_file_size" in stats
         assert "storage_path" in stats
 
-    @pytest.mark.asyncio
     async def test_metadata_persistence(self, file_service, mock_upload_file):
         """Test that metadata persists correctly."""
         # Upload a file
@@ -298,7 +278,7 @@ class TestFileService:
         original_metadata = await file_service.save_file(upload_file)
 
         # Create new service instance (simulating restart)
-        new_service = FileService()
+        new_service = FileService(file_service.paths)
 
         # Load metadata
         loaded_metadata = new_service._load_metadata(original_metadata.id)
@@ -309,9 +289,8 @@ class TestFileService:
         assert loaded_metadata.size == original_metadata.size
         assert loaded_metadata.mime_type == original_metadata.mime_type
 
-    @pytest.mark.asyncio
     async def test_syft_url_generation(
-        self, file_service, mock_upload_file, monkeypatch
+        self, file_service, mock_upload_file, monkeypatch, settings_override
     ):
         """Test syft URL generation when syft_core is configured."""
 
@@ -324,7 +303,7 @@ class TestFileService:
 
         mock_client = MockSyftClient()
         monkeypatch.setattr("app.services.file_service.syft_client", mock_client)
-        monkeypatch.setattr("app.config.settings.SYFT_USER_EMAIL", "test@example.com")
+        settings_override(SYFT_USER_EMAIL="test@example.com")
 
         # Upload a file
         upload_file = mock_upload_file()
@@ -335,12 +314,32 @@ class TestFileService:
         assert metadata.syft_url.startswith("syft://test@example.com/")
         assert metadata.filename in metadata.syft_url
 
-    @pytest.mark.asyncio
-    async def test_syft_url_none_when_disabled(self, file_service, mock_upload_file):
-        """Test that syft_url is None when syft_core is not configured."""
-        # syft_client is already None in the fixture
+    async def test_syft_url_set_with_fixture_client(
+        self, file_service, mock_upload_file
+    ):
+        """Test that uploads get a syft_url from the fixture's mock client."""
+        # syft_core is mandatory, so the fixture always provides a client
         upload_file = mock_upload_file()
         metadata = await file_service.save_file(upload_file)
 
-        # Verify syft_url is None
         assert metadata.syft_url is not None
+
+
+@pytest.mark.parametrize(
+    "dangerous_name",
+    [
+        "../../../etc/passwd.txt",
+        "..\\..\\windows\\system32\\config\\sam.txt",
+        "file<script>.txt",
+        "file|pipe.txt",
+        "file:colon.txt",
+    ],
+)
+def test_sanitize_dangerous_filename(dangerous_name):
+    """Test filename sanitization for dangerous filenames."""
+    safe_name = sanitize_filename(dangerous_name)
+
+    for unsafe in ("..", "<", ">", "|", ":"):
+        assert unsafe not in safe_name
+    # Check that extension is preserved
+    assert safe_name.endswith(".txt")
@@ -4,14 +4,17 @@ from fastapi.testclient import TestClient
 
 from app.config import settings
 
+FILES_URL = f"{settings.API_PREFIX}/files/"
+TEST_TXT = ("test.txt", b"Test content", "text/plain")
+
 
 class TestSyftUrlGeneration:
     """Test that syft_url is always present and valid in API responses."""
 
     def test_upload_returns_syft_url(self, client: TestClient):
         """Test that file upload returns a non-null syft_url."""
-        files = {"file": ("test.txt", b"Test content", "text/plain")}
-        response = client.post(f"{settings.API_PREFIX}/files/", files=files)
+        files = {"file": TEST_TXT}
+        response = client.post(FILES_URL, files=files)
 
         assert response.status_code == 201
         data = response.json()
@@ -35,12 +38,12 @@ class TestSyftUrlGeneration:
         uploaded_ids = []
         for filename, content, content_type in files_to_upload:
             files = {"file": (filename, content, content_type)}
-            response = client.post(f"{settings.API_PREFIX}/files/", files=files)
+            response = client.post(FILES_URL, files=files)
             assert response.status_code == 201
             uploaded_ids.append(response.json()["id"])
 
         # List files
-        response = client.get(f"{settings.API_PREFIX}/files/")
+        response = client.get(FILES_URL)
         assert response.status_code == 200
 
         data = response.json()
@@ -58,15 +61,16 @@ class TestSyftUrlGeneration:
         """Test that file update maintains syft_url format."""
         # Upload initial file
         files = {"file": ("original.txt", b"Original content", "text/plain")}
-        response = client.post(f"{settings.API_PREFIX}/files/", files=files)
+        response = client.post(FILES_URL, files=files)
         assert response.status_code == 201
 
-        file_id = response.json()["id"]
-        original_syft_url = response.json()["syft_url"]
+        data = response.json()
+        file_id = data["id"]
+        original_syft_url = data["syft_url"]
 
         # Update file
         new_files = {"file": ("updated.txt", b"Updated content", "text/plain")}
-        response = client.put(f"{settings.API_PREFIX}/files/{file_id}", files=new_files)
+        response = client.put(f"{FILES_URL}{file_id}", files=new_files)
         assert response.status_code == 200
 
         data = response.json()
@@ -82,7 +86,7 @@ class TestSyftUrlGeneration:
     def test_syft_url_follows_expected_pattern(self, client: TestClient):
         """Test that syft_url follows the expected pattern."""
         files = {"file": ("pattern_test.txt", b"Test content", "text/plain")}
-        response = client.post(f"{settings.API_PREFIX}/files/", files=files)
+        response = client.post(FILES_URL, files=files)
 
         assert response.status_code == 201
         syft_url = response.json()["syft_url"]
@@ -97,7 +101,7 @@ class TestSyftUrlGeneration:
 
     def test_storage_stats_includes_syft_paths(self, client: TestClient):
         """Test that storage stats includes syft-based storage path."""
-        response = client.get(f"{settings.API_PREFIX}/files/stats/summary")
+        response = client.get(f"{FILES_URL}stats/summary")
         assert response.status_code == 200
 
         data = response.json()
@@ -1,11 +1,14 @@
 import hashlib
+import os
 
 import pytest
 
+from app.config import Settings, settings
 from app.utils.file_utils import (
     calculate_file_hash,
     ensure_directory_exists,
     generate_storage_filename,
+    get_file_extension,
     parse_storage_filename,
     sanitize_filename,
     validate_file_size,
@@ -13,6 +16,17 @@ from app.utils.file_utils import (
 )
 
 
+def expected_hash(content: bytes) -> str:
+    """Digest of ``content`` with the configured file hash algorithm."""
+    return hashlib.new(settings.FILE_HASH_ALGORITHM, content).hexdigest()
+
+
+# Allows JPEG images only; passed to validators instead of patching settings
+IMAGE_ONLY_SETTINGS = Settings(
+    ALLOWED_MIME_TYPES={"image/jpeg"}, ALLOWED_EXTENSIONS={".jpg", ".jpeg"}
+)
+
+
 class TestFileUtils:
     """Test file utility functions."""
 
@@ -56,15 +70,11 @@ class TestFileUtils:
         assert sanitize_filename("файл<script>.txt") == "script.txt"
         assert sanitize_filename("文件|pipe.txt") == "pipe.txt"
 
-    def test_validate_file_type_valid(self, monkeypatch):
+    def test_validate_file_type_valid(self, settings_override):
         """Test validation of allowed file types."""
-        # Mock settings
-        monkeypatch.setattr(
-            "app.config.settings.ALLOWED_MIME_TYPES",
-            {"text/plain", "image/jpeg", "application/pdf"},
-        )
-        monkeypatch.setattr(
-            "app.config.settings.ALLOWED_EXTENSIONS", {".txt", ".jpg", ".jpeg", ".pdf"}
+        settings_override(
+            ALLOWED_MIME_TYPES={"text/plain", "image/jpeg", "application/pdf"},
+            ALLOWED_EXTENSIONS={".txt", ".jpg", ".jpeg", ".pdf"},
         )
 
         assert validate_file_type("text/plain", "test.txt") is True
@@ -72,16 +82,10 @@ class TestFileUtils:
         assert validate_file_type("image/jpeg", "photo.jpeg") is True
         assert validate_file_type("application/pdf", "document.pdf") is True
 
-    def test_validate_file_type_invalid(self, monkeypatch):
+    def test_validate_file_type_invalid(self, settings_override):
         """Test file type validation with invalid types."""
-        from app.utils.file_utils import validate_file_type
-
-        # Patch where settings is used in file_utils
-        monkeypatch.setattr(
-            "app.utils.file_utils.settings.ALLOWED_MIME_TYPES", {"image/jpeg"}
-        )
-        monkeypatch.setattr(
-            "app.utils.file_utils.settings.ALLOWED_EXTENSIONS", {".jpg"}
+        settings_override(
+            ALLOWED_MIME_TYPES={"image/jpeg"}, ALLOWED_EXTENSIONS={".jpg"}
         )
 
         # These should be invalid (both MIME and extension must match)
@@ -92,22 +96,49 @@ class TestFileUtils:
         # This should be valid
         assert validate_file_type("image/jpeg", "photo.jpg") is True
 
-    def test_validate_file_size_valid(self, monkeypatch):
+    @pytest.mark.parametrize(
+        "mime_type,filename,allowed",
+        [
+            ("image/jpeg", "photo.jpg", True),
+            ("image/jpeg", "photo.JPEG", True),
+            ("text/plain", "test.txt", False),  # MIME type not allowed
+            ("image/jpeg", "photo.png", False),  # Extension not allowed
+            ("image/jpeg", "jpg", False),  # No extension
+        ],
+    )
+    def test_validate_file_type_with_config(self, mime_type, filename, allowed):
+        """Test validation against explicitly passed settings."""
+        assert validate_file_type(mime_type, filename, IMAGE_ONLY_SETTINGS) is allowed
+
+    @pytest.mark.parametrize(
+        "filename,expected",
+        [
+            ("photo.JPG", ".jpg"),
+            ("archive.tar.gz", ".gz"),
+            ("noext", ""),
+            (".bashrc", ""),
+            ("..hidden.txt", ".txt"),
+            ("trailing.", "."),
+            ("dir.d/file", ""),
+        ],
+    )
+    def test_get_file_extension(self, filename, expected):
+        """Test extension parsing matches os.path.splitext semantics."""
+        assert get_file_extension(filename) == expected
+        assert get_file_extension(filename) == os.path.splitext(filename)[1].lower()
+
+    def test_validate_file_size_valid(self, settings_override):
         """Test file size validation within limits."""
-        monkeypatch.setattr(
-            "app.config.settings.MAX_FILE_SIZE", 10 * 1024 * 1024
-        )  # 10MB
+        settings_override(MAX_FILE_SIZE=10 * 1024 * 1024)  # 10MB
 
         assert validate_file_size(1) is True  # Minimum valid size
         assert validate_file_size(1024) is True  # 1KB
         assert validate_file_size(1024 * 1024) is True  # 1MB
         assert validate_file_size(10 * 1024 * 1024) is True  # Exactly 10MB
 
-    def test_validate_file_size_invalid(self, monkeypatch):
+    def test_validate_file_size_invalid(self, settings_override):
         """Test file size validation exceeding limits."""
-        monkeypatch.setattr(
-            "app.config.settings.MAX_FILE_SIZE", 10 * 1024 * 1024
-        )  # 10MB
+        settings_override(MAX_FILE_SIZE=10 * 1024 * 1024)  # 10MB
 
         assert validate_file_size(0) is False  # Zero size is invalid
         assert validate_file_size(10 * 1024 * 1024 + 1) is False  # 10MB + 1 byte
@@ -186,16 +217,14 @@ class TestFileUtils:
         # Calculate hash
         hash_result = calculate_file_hash(test_file)
 
-        # Verify it's a valid SHA256 hash (64 hex characters)
-        assert len(hash_result) == 64
+        # Verify it's a valid hex digest
         assert all(c in "0123456789abcdef" for c in hash_result)
 
         # Verify consistency
         assert hash_result == calculate_file_hash(test_file)
 
         # Verify against known hash
-        expected_hash = hashlib.sha256(test_content).hexdigest()
-        assert hash_result == expected_hash
+        assert hash_result == expected_hash(test_content)
 
     def test_calculate_file_hash_different_files(self, tmp_path):
         """Test that different files produce different hashes."""
@@ -221,9 +250,20 @@ class TestFileUtils:
         # Should handle large files efficiently (chunks)
         hash_result = calculate_file_hash(large_file)
 
-        assert len(hash_result) == 64
-        expected_hash = hashlib.sha256(large_content).hexdigest()
-        assert hash_result == expected_hash
+        assert hash_result == expected_hash(large_content)
+
+    @pytest.mark.parametrize(
+        "size",
+        [0, 100, 64 * 1024, 3 * 1024 * 1024],
+        ids=["empty", "one-shot", "buffered", "mmap"],
+    )
+    def test_calculate_file_hash_read_strategies(self, tmp_path, size):
+        """Test that every read strategy produces the same hash."""
+        test_file = tmp_path / "data.bin"
+        content = bytes(range(256)) * (size // 256) + b"x" * (size % 256)
+        test_file.write_bytes(content)
+
+        assert calculate_file_hash(test_file) == expected_hash(content)
 
     @pytest.mark.parametrize(
         "filename,expected",
@@ -1,17 +1,38 @@
-import json
 import logging
 from typing import Any, AsyncIterator, Dict
 
+import orjson
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from src.core.exceptions import SessionNotFoundError
 from src.models.chat import ChatRequest
 from src.services.chat import chat_service
 
-router = APIRouter(prefix="/api/chat", tags=["chat"])
+router = APIRouter(
+    prefix="/api/chat", tags=["chat"], default_response_class=ORJSONResponse
+)
 logger = logging.getLogger(__name__)
 
+# Server-sent event framing
+SSE_PREFIX = b"data: "
+SSE_SUFFIX = b"\n\n"
+DONE_EVENT = b'data: {"type":"done"}\n\n'
+ERROR_EVENT = b'data: {"type":"error","error":"An internal error occurred."}\n\n'
+# Content frames are sent per token, so only the chunk itself is encoded
+CONTENT_EVENT_PREFIX = b'data: {"type":"content","content":'
+CONTENT_EVENT_SUFFIX = b"}\n\n"
+
+
+def _sse_event(payload: Dict[str, Any]) -> bytes:
+    """Encode a payload as a server-sent event frame."""
+    return SSE_PREFIX + orjson.dumps(payload) + SSE_SUFFIX
+
+
+def _content_event(chunk: str) -> bytes:
+    """Encode a streamed content chunk as a server-sent event frame."""
+    return CONTENT_EVENT_PREFIX + orjson.dumps(chunk) + CONTENT_EVENT_SUFFIX
+
 
 @router.post("/")
 async def chat_endpoint(
@@ -29,29 +50,24 @@ async def chat_endpoint(
         session = await chat_service.get_or_create_session(session_id)
         session_id = session.session_id
 
-        async def generate() -> AsyncIterator[str]:
+        async def generate() -> AsyncIterator[bytes]:
             """Generate SSE events."""
             try:
                 # Send session ID first
-                session_data = json.dumps({"type": "session", "session_id": session_id})
-                yield f"data: {session_data}\n\n"
+                yield _sse_event({"type": "session", "session_id": session_id})
 
                 # Stream the response
                 async for chunk in chat_service.process_message_stream(
                     session_id, request.message, file_ids=request.file_ids
                 ):
-                    data = json.dumps({"type": "content", "content": chunk})
-                    yield f"data: {data}\n\n"
+                    yield _content_event(chunk)
 
                 # Send completion signal
-                yield f"data: {json.dumps({'type': 'done'})}\n\n"
+                yield DONE_EVENT
 
             except Exception as e:
                 logger.error(f"Error in generate function: {str(e)}")
-                error_data = json.dumps(
-                    {"type": "error", "error": "An internal error occurred."}
-                )
-                yield f"data: {error_data}\n\n"
+                yield ERROR_EVENT
 
         response = StreamingResponse(
             generate(),
@@ -4,12 +4,15 @@ import logging
 from typing import Dict, List
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 from src.core.exceptions import ExternalServiceError
-from src.services.file_manager_client import FileInfo, file_manager_client
+from src.services.file_manager_client import FileInfo, get_file_manager_client
 
-router = APIRouter(prefix="/api/files", tags=["files"])
+router = APIRouter(
+    prefix="/api/files", tags=["files"], default_response_class=ORJSONResponse
+)
 logger = logging.getLogger(__name__)
 
 
@@ -38,7 +41,7 @@ async def list_files() -> List[FileInfo]:
         HTTPException: If file manager service is unavailable
     """
     try:
-        files = await file_manager_client.get_files()
+        files = await get_file_manager_client().get_files()
         return files
 
     except ExternalServiceError as e:
@@ -67,7 +70,7 @@ async def get_file_content(file_id: str) -> Dict[str, str]:
         HTTPException: If file not found or service unavailable
     """
     try:
-        content = await file_manager_client.get_file_content(file_id)
+        content = await get_file_manager_client().get_file_content(file_id)
         return {"file_id": file_id, "content": content}
 
     except ExternalServiceError as e:
@@ -111,7 +114,7 @@ async def get_multiple_files_content(
                 status_code=400, detail="Maximum 10 files can be requested at once"
             )
 
-        contents = await file_manager_client.get_multiple_files_content(
+        contents = await get_file_manager_client().get_multiple_files_content(
             request.file_ids
         )
 
@@ -138,7 +141,7 @@ async def get_multiple_files_content(
 async def check_file_manager_health() -> Dict[str, bool]:
     """Check if file manager service is accessible."""
     try:
-        is_healthy = await file_manager_client.health_check()
+        is_healthy = await get_file_manager_client().health_check()
         return {"file_manager_available": is_healthy}
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}")
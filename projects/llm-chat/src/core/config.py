@@ -23,6 +23,7 @@ class Settings(BaseSettings):
     # Session Configuration
     max_history_length: int = 25
     session_timeout_minutes: int = 60
+    max_sessions: int = 10000
 
     # Streaming Configuration
     stream_chunk_size: int = 512
@@ -39,5 +40,11 @@ class Settings(BaseSettings):
 
 @lru_cache()
 def get_settings() -> Settings:
-    """Get cached settings instance."""
+    """
+    Get cached settings instance.
+
+    Tests that change the environment should call ``monkeypatch.setenv``
+    followed by ``get_settings.cache_clear()`` rather than reloading this
+    module, so the next call builds a fresh Settings.
+    """
     return Settings()
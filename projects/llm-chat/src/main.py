@@ -1,12 +1,13 @@
 #!/usr/bin/env python3
 """Main module for llm-chat."""
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from typing import AsyncIterator, Dict
 
 import uvicorn
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
@@ -14,6 +15,8 @@ from fastapi.templating import Jinja2Templates
 from src.api.routes import chat, files
 from src.core.config import get_settings
 from src.services.chat import chat_service
+from src.services.file_manager_client import get_file_manager_client
+from src.services.openai_client import close_openai_client, warm_openai_client
 
 # Configure logging
 logging.basicConfig(
@@ -28,8 +31,13 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     logger.info("Starting up LLM Chat Application...")
     # Start background cleanup task
     await chat_service.start_cleanup_task()
+    # Warm the OpenAI connection in the background so startup isn't delayed
+    warm_task = asyncio.create_task(warm_openai_client())
     yield
+    warm_task.cancel()
     logger.info("Shutting down LLM Chat Application...")
+    await get_file_manager_client().aclose()
+    await close_openai_client()
 
 
 # Create FastAPI app
@@ -46,15 +54,18 @@ app.mount("/static", StaticFiles(directory="src/static"), name="static")
 # Setup templates
 templates = Jinja2Templates(directory="src/templates")
 
+# The chat page uses no request data, so render it once at startup
+CHAT_PAGE = templates.get_template("chat.html").render().encode()
+
 # Include routers
 app.include_router(chat.router)
 app.include_router(files.router)
 
 
 @app.get("/", response_class=HTMLResponse)
-async def root(request: Request) -> HTMLResponse:
+async def root() -> HTMLResponse:
     """Serve the main chat interface."""
-    return templates.TemplateResponse("chat.html", {"request": request})
+    return HTMLResponse(content=CHAT_PAGE)
 
 
 @app.get("/health")
@@ -71,6 +82,10 @@ def main() -> None:
         host="0.0.0.0",
         port=8000,
         reload=settings.debug,
+        # Installed by uvicorn[standard]; cheaper per-chunk event loop and
+        # HTTP parsing for streamed responses
+        loop="uvloop",
+        http="httptools",
         log_level="info",
     )
 
@@ -1,19 +1,27 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Dict, List, Literal, Optional
+from typing import Deque, Dict, List, Literal, Optional
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, Field
 
+from src.core.config import get_settings
 
-class ChatMessage(BaseModel):
-    """Single chat message."""
 
-    model_config = ConfigDict(populate_by_name=True)
+@dataclass(frozen=True, slots=True)
+class ChatMessage:
+    """Single chat message.
+
+    Only built internally from already validated requests, so it skips model
+    validation.
+    """
 
-    id: UUID = Field(default_factory=uuid4)
     role: Literal["user", "assistant", "system"]
     content: str
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    id: UUID = field(default_factory=uuid4)
+    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
 
 class ChatRequest(BaseModel):
@@ -31,27 +39,39 @@ class ChatResponse(BaseModel):
     session_id: str
 
 
-class ChatSession(BaseModel):
-    """Chat session with message history."""
+@dataclass(slots=True)
+class ChatSession:
+    """Chat session with message history.
+
+    A plain dataclass rather than a model so history can be a bounded deque
+    that drops the oldest message on append.
+    """
 
     session_id: str
-    messages: List[ChatMessage] = Field(default_factory=list)
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    last_accessed: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    max_history_length: int = field(
+        default_factory=lambda: get_settings().max_history_length
+    )
+    messages: Deque[ChatMessage] = field(init=False)
+    # OpenAI-format copy of the history, kept in step with messages
+    _openai_messages: Deque[Dict[str, str]] = field(init=False, repr=False)
+    # time.monotonic() seconds; ChatService tracks last access for expiry
+    created_at: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self) -> None:
+        self.messages = deque(maxlen=self.max_history_length)
+        self._openai_messages = deque(maxlen=self.max_history_length)
 
     def add_message(self, role: Literal["user", "assistant"], content: str) -> None:
         """Add message to history maintaining max length."""
         message = ChatMessage(role=role, content=content)
+        # The deque keeps only the last max_history_length messages
         self.messages.append(message)
-        self.last_accessed = datetime.now(timezone.utc)
-
-        # Keep only last max_history_length messages
-        from src.core.config import get_settings
-
-        settings = get_settings()
-        if len(self.messages) > settings.max_history_length:
-            self.messages = self.messages[-settings.max_history_length :]
+        self._openai_messages.append({"role": role, "content": content})
 
     def get_openai_messages(self) -> List[Dict[str, str]]:
-        """Convert messages to OpenAI format."""
-        return [{"role": msg.role, "content": msg.content} for msg in self.messages]
+        """Return messages in OpenAI format.
+
+        The dicts are shared with the session, so callers must replace
+        entries rather than modify them.
+        """
+        return list(self._openai_messages)
@@ -1,29 +1,56 @@
 import asyncio
+import heapq
 import logging
-from datetime import datetime, timedelta, timezone
-from typing import AsyncIterator, Dict, List, Optional, cast
-from uuid import uuid4
+import secrets
+import time
+from collections import OrderedDict
+from functools import cached_property
+from typing import AsyncIterator, Dict, List, Optional, Tuple, cast
 
 from openai.types.chat import ChatCompletionMessageParam
 
 from src.core.config import get_settings
 from src.core.exceptions import ExternalServiceError, SessionNotFoundError
 from src.models.chat import ChatSession
-from src.services.file_manager_client import file_manager_client
+from src.services.file_manager_client import get_file_manager_client
 from src.services.openai_client import OpenAIService
 
 logger = logging.getLogger(__name__)
 
+# Prompt sent when files are attached; the question and file contents are
+# filled in per message
+CONTEXT_MESSAGE_TEMPLATE = """<user_question>
+{question}
+</user_question>
+
+<context>
+{context}
+</context>"""
+CONTEXT_SEPARATOR = "\n\n---\n\n"
+
+# Seconds the cleanup task waits before checking again when no session is open
+CLEANUP_IDLE_INTERVAL = 60.0
+
 
 class ChatService:
     """Service for managing chat sessions and conversations."""
 
     def __init__(self) -> None:
-        self.sessions: Dict[str, ChatSession] = {}
-        self.openai_service = OpenAIService()
+        # Least recently used sessions first
+        self.sessions: OrderedDict[str, ChatSession] = OrderedDict()
+        # Last access time per session, the only record of session activity
+        self._last_accessed: Dict[str, float] = {}
+        # (expiry time, session_id) min-heap, pushed on every access; entries
+        # for sessions accessed again since are skipped when popped
+        self._expiry_heap: List[Tuple[float, str]] = []
         self.settings = get_settings()
         self._cleanup_task: Optional[asyncio.Task[None]] = None
 
+    @cached_property
+    def openai_service(self) -> OpenAIService:
+        """OpenAI service, created on the first completion request."""
+        return OpenAIService()
+
     async def start_cleanup_task(self) -> None:
         """Start the background cleanup task."""
         if self._cleanup_task is None:
@@ -35,17 +62,49 @@ class ChatService:
         """Get existing session or create a new one."""
         if session_id and session_id in self.sessions:
             session = self.sessions[session_id]
-            session.last_accessed = datetime.now(timezone.utc)
+            self.sessions.move_to_end(session_id)
+            self._touch(session_id, time.monotonic())
             return session
 
-        # Create new session
-        new_session_id = session_id or str(uuid4())
-        session = ChatSession(session_id=new_session_id)
+        # Create new session, evicting the least recently used one when full
+        new_session_id = session_id or secrets.token_hex(16)
+        session = ChatSession(
+            session_id=new_session_id,
+            max_history_length=self.settings.max_history_length,
+        )
+        if len(self.sessions) >= self.settings.max_sessions:
+            self._remove_session(next(iter(self.sessions)))
         self.sessions[new_session_id] = session
+        self._touch(new_session_id, session.created_at)
         sanitized_session_id = new_session_id.replace("\r\n", "").replace("\n", "")
         logger.info(f"Created new session: {sanitized_session_id}")
         return session
 
+    @property
+    def _session_timeout(self) -> float:
+        """Idle time in seconds after which a session expires."""
+        return self.settings.session_timeout_minutes * 60
+
+    def _touch(self, session_id: str, accessed_at: float) -> None:
+        """Record an access and schedule the session's expiry."""
+        self._last_accessed[session_id] = accessed_at
+        heapq.heappush(
+            self._expiry_heap, (accessed_at + self._session_timeout, session_id)
+        )
+
+        # Drop superseded entries once they outnumber live sessions
+        if len(self._expiry_heap) > 2 * len(self._last_accessed) + 64:
+            self._expiry_heap = [
+                (last_accessed + self._session_timeout, sid)
+                for sid, last_accessed in self._last_accessed.items()
+            ]
+            heapq.heapify(self._expiry_heap)
+
+    def _remove_session(self, session_id: str) -> None:
+        """Drop a session and its access time."""
+        self.sessions.pop(session_id, None)
+        self._last_accessed.pop(session_id, None)
+
     async def process_message_stream(
         self, session_id: str, user_message: str, file_ids: Optional[List[str]] = None
     ) -> AsyncIterator[str]:
@@ -68,29 +127,27 @@ class ChatService:
             # If we have file context, replace the last user message with
             # enhanced version
             if enhanced_message != user_message and messages:
-                messages[-1]["content"] = enhanced_message
-
-            # Convert to ChatCompletionMessageParam type
-            typed_messages: List[ChatCompletionMessageParam] = [
-                cast(
-                    ChatCompletionMessageParam,
-                    {"role": msg["role"], "content": msg["content"]},
-                )
-                for msg in messages
-            ]
+                messages[-1] = {"role": "user", "content": enhanced_message}
+
+            # The history dicts already have the OpenAI message shape
+            typed_messages = cast(List[ChatCompletionMessageParam], messages)
 
-            # Track the full response for history
-            full_response = ""
+            # Collect chunks for history; joined once at the end
+            chunks: List[str] = []
 
             # Stream response from OpenAI
             async for chunk in self.openai_service.create_chat_completion_stream(
                 typed_messages
             ):
-                full_response += chunk
+                chunks.append(chunk)
                 yield chunk
 
             # Add assistant response to history
-            session.add_message("assistant", full_response)
+            session.add_message("assistant", "".join(chunks))
+
+            # A long reply counts as activity; skip sessions dropped meanwhile
+            if session.session_id in self.sessions:
+                self._touch(session.session_id, time.monotonic())
 
         except Exception as e:
             logger.error(f"Error processing message: {str(e)}")
@@ -114,7 +171,7 @@ class ChatService:
 
         try:
             # Fetch file contents
-            file_contents = await file_manager_client.get_multiple_files_content(
+            file_contents = await get_file_manager_client().get_multiple_files_content(
                 file_ids
             )
 
@@ -123,21 +180,15 @@ class ChatService:
                 return user_message
 
             # Build context section
-            context_parts = []
-            for file_id, content in file_contents.items():
-                # Try to get filename from file list (optional enhancement)
-                context_parts.append(f"File ID: {file_id}\n{content}")
-
-            context_text = "\n\n---\n\n".join(context_parts)
+            context_text = CONTEXT_SEPARATOR.join(
+                f"File ID: {file_id}\n{content}"
+                for file_id, content in file_contents.items()
+            )
 
             # Build enhanced message using the template format
-            enhanced_message = f"""<user_question>
-{user_message}
-</user_question>
-
-<context>
-{context_text}
-</context>"""
+            enhanced_message = CONTEXT_MESSAGE_TEMPLATE.format(
+                question=user_message, context=context_text
+            )
 
             logger.info(
                 f"Enhanced message with {len(file_contents)} file(s) as context"
@@ -155,31 +206,39 @@ class ChatService:
     async def clear_session(self, session_id: str) -> None:
         """Clear a specific session."""
         if session_id in self.sessions:
-            del self.sessions[session_id]
+            self._remove_session(session_id)
             sanitized_session_id = session_id.replace("\r\n", "").replace("\n", "")
             logger.info(f"Cleared session: {sanitized_session_id}")
         else:
             raise SessionNotFoundError(f"Session {session_id} not found")
 
+    def _expire_sessions(self, now: float) -> None:
+        """Remove sessions whose expiry time has passed."""
+        expired = 0
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, session_id = heapq.heappop(self._expiry_heap)
+            last_accessed = self._last_accessed.get(session_id)
+            # Already removed, or accessed again and rescheduled
+            if last_accessed is None or last_accessed + self._session_timeout > now:
+                continue
+            self._remove_session(session_id)
+            expired += 1
+
+        if expired:
+            logger.info("Cleaned up %d old session(s)", expired)
+
     async def _cleanup_old_sessions(self) -> None:
-        """Background task to clean up old sessions."""
+        """Background task to clean up old sessions as they expire."""
         while True:
             try:
-                await asyncio.sleep(300)  # Check every 5 minutes
-
-                cutoff_time = datetime.now(timezone.utc) - timedelta(
-                    minutes=self.settings.session_timeout_minutes
-                )
-
-                sessions_to_remove = [
-                    session_id
-                    for session_id, session in self.sessions.items()
-                    if session.last_accessed < cutoff_time
-                ]
-
-                for session_id in sessions_to_remove:
-                    del self.sessions[session_id]
-                    logger.info(f"Cleaned up old session: {session_id}")
+                # Sleep until the next scheduled expiry
+                if self._expiry_heap:
+                    delay = max(0.0, self._expiry_heap[0][0] - time.monotonic())
+                else:
+                    delay = CLEANUP_IDLE_INTERVAL
+                await asyncio.sleep(delay)
+
+                self._expire_sessions(time.monotonic())
 
             except Exception as e:
                 logger.error(f"Error in session cleanup: {str(e)}")
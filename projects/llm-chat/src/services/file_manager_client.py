@@ -1,8 +1,12 @@
 """Client service for interacting with the File Manager API."""
 
+import asyncio
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 import httpx
 from pydantic import BaseModel
@@ -12,6 +16,13 @@ from src.core.exceptions import ExternalServiceError
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on simultaneous file content requests
+MAX_CONCURRENT_FETCHES = 8
+# File contents are reused across chat turns for this many seconds
+FILE_CONTENT_CACHE_TTL = 300.0
+# Most file contents kept in the cache before the least recently used goes
+FILE_CONTENT_CACHE_SIZE = 128
+
 
 class FileInfo(BaseModel):
     """File information from the file manager."""
@@ -24,6 +35,14 @@ class FileInfo(BaseModel):
     syft_url: Optional[str] = None
 
 
+class CachedContent(NamedTuple):
+    """File content cached by FileManagerClient."""
+
+    fetched_at: float
+    etag: Optional[str]
+    content: str
+
+
 class FileManagerClient:
     """Client for interacting with the File Manager API."""
 
@@ -31,6 +50,27 @@ class FileManagerClient:
         settings = get_settings()
         self.base_url = settings.file_manager_api_url
         self.timeout = httpx.Timeout(30.0)  # 30 second timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        # Cached file contents by ID, least recently used first
+        self._content_cache: OrderedDict[str, CachedContent] = OrderedDict()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use.
+
+        Reusing one client keeps connections to the file manager pooled
+        instead of opening a new one per request.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url, timeout=self.timeout
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def get_files(self) -> List[FileInfo]:
         """
@@ -43,24 +83,23 @@ class FileManagerClient:
             ExternalServiceError: If the request fails
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(f"{self.base_url}/api/files/")
-                response.raise_for_status()
+            response = await self._get_client().get("/api/files/")
+            response.raise_for_status()
 
-                data = response.json()
-                files = []
+            data = response.json()
+            files = []
 
-                for file_data in data.get("files", []):
-                    # Convert ISO datetime string to datetime object
-                    if isinstance(file_data.get("upload_date"), str):
-                        file_data["upload_date"] = datetime.fromisoformat(
-                            file_data["upload_date"].replace("Z", "+00:00")
-                        )
+            for file_data in data.get("files", []):
+                # Convert ISO datetime string to datetime object
+                if isinstance(file_data.get("upload_date"), str):
+                    file_data["upload_date"] = datetime.fromisoformat(
+                        file_data["upload_date"].replace("Z", "+00:00")
+                    )
 
-                    files.append(FileInfo(**file_data))
+                files.append(FileInfo(**file_data))
 
-                logger.info(f"Retrieved {len(files)} files from file manager")
-                return files
+            logger.info(f"Retrieved {len(files)} files from file manager")
+            return files
 
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error from file manager: {e.response.status_code}")
@@ -76,10 +115,22 @@ class FileManagerClient:
             logger.error(f"Unexpected error fetching files: {str(e)}")
             raise ExternalServiceError("Unexpected error while fetching files")
 
+    def _cache_content(self, file_id: str, etag: Optional[str], content: str) -> None:
+        """Store file content, evicting the least recently used entry if full."""
+        self._content_cache[file_id] = CachedContent(time.monotonic(), etag, content)
+        self._content_cache.move_to_end(file_id)
+        if len(self._content_cache) > FILE_CONTENT_CACHE_SIZE:
+            self._content_cache.popitem(last=False)
+
     async def get_file_content(self, file_id: str) -> str:
         """
         Retrieve the content of a specific file.
 
+        Contents are cached for FILE_CONTENT_CACHE_TTL seconds, so a file
+        attached on several chat turns is only downloaded once. Expired
+        entries are revalidated with their ETag, and a 304 reuses the cached
+        content without transferring it again.
+
         Args:
             file_id: The UUID of the file
 
@@ -89,21 +140,37 @@ class FileManagerClient:
         Raises:
             ExternalServiceError: If the request fails
         """
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(f"{self.base_url}/api/files/{file_id}")
-                response.raise_for_status()
-
-                # Read the content as text
-                content = response.text
+        cached = self._content_cache.get(file_id)
+        headers: Dict[str, str] = {}
+        if cached is not None:
+            self._content_cache.move_to_end(file_id)
+            if time.monotonic() - cached.fetched_at < FILE_CONTENT_CACHE_TTL:
+                return cached.content
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
 
-                logger.info(
-                    f"Retrieved content for file {file_id}, size: {len(content)} chars"
-                )
-                return content
+        try:
+            response = await self._get_client().get(
+                f"/api/files/{file_id}", headers=headers
+            )
+            if cached is not None and response.status_code == 304:
+                # Unchanged since it was cached; restart its TTL
+                self._cache_content(file_id, cached.etag, cached.content)
+                return cached.content
+            response.raise_for_status()
+
+            # Read the content as text
+            content = response.text
+            self._cache_content(file_id, response.headers.get("ETag"), content)
+
+            logger.debug(
+                "Retrieved content for file %s, size: %d chars", file_id, len(content)
+            )
+            return content
 
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
+                self._content_cache.pop(file_id, None)
                 logger.warning(f"File not found: {file_id}")
                 raise ExternalServiceError(f"File {file_id} not found")
 
@@ -129,18 +196,32 @@ class FileManagerClient:
             Dictionary mapping file_id to content
 
         Note:
-            Failed retrievals are logged but don't stop the process
+            Files are fetched concurrently (at most MAX_CONCURRENT_FETCHES at
+            a time). Failed retrievals are logged but don't stop the process
         """
-        contents = {}
-
-        for file_id in file_ids:
-            try:
-                content = await self.get_file_content(file_id)
-                contents[file_id] = content
-            except ExternalServiceError as e:
-                logger.warning(f"Failed to retrieve file {file_id}: {str(e)}")
-                # Continue with other files
-
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+
+        async def fetch(file_id: str) -> Tuple[str, Optional[str]]:
+            async with semaphore:
+                try:
+                    return file_id, await self.get_file_content(file_id)
+                except ExternalServiceError as e:
+                    logger.warning(f"Failed to retrieve file {file_id}: {str(e)}")
+                    # Continue with other files
+                    return file_id, None
+
+        results = await asyncio.gather(*(fetch(file_id) for file_id in file_ids))
+        contents = {
+            file_id: content for file_id, content in results if content is not None
+        }
+
+        # One line per batch rather than one per file
+        logger.info(
+            "Retrieved %d/%d files (%s)",
+            len(contents),
+            len(file_ids),
+            ",".join(contents),
+        )
         return contents
 
     async def health_check(self) -> bool:
@@ -151,13 +232,16 @@ class FileManagerClient:
             True if service is healthy, False otherwise
         """
         try:
-            async with httpx.AsyncClient(timeout=httpx.Timeout(5.0)) as client:
-                response = await client.get(f"{self.base_url}/health")
-                return response.status_code == 200
+            response = await self._get_client().get(
+                "/health", timeout=httpx.Timeout(5.0)
+            )
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"File manager health check failed: {str(e)}")
             return False
 
 
-# Global instance
-file_manager_client = FileManagerClient()
+@lru_cache()
+def get_file_manager_client() -> FileManagerClient:
+    """Get the shared client, creating it on first use."""
+    return FileManagerClient()
@@ -1,82 +1,247 @@
+import asyncio
+import importlib.util
 import logging
 import os
-from typing import AsyncIterator, List, Optional
+import time
+from typing import AsyncIterator, Awaitable, List, Optional
 
-from openai import AsyncOpenAI
+import httpx
+import orjson
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from openai.types.chat import ChatCompletionMessageParam
 
 from src.core.config import get_settings
+from src.core.exceptions import OpenAIServiceError
 
 logger = logging.getLogger(__name__)
 
+# Server-sent event framing used by the chat completions stream
+SSE_DATA_PREFIX = "data: "
+SSE_DONE = "[DONE]"
+# Coalesced deltas are flushed at least this often while tokens arrive
+STREAM_FLUSH_INTERVAL = 0.02
+
+# Tests set APP_ENV before importing the app, so this is fixed per process
+_TESTING = os.getenv("APP_ENV") == "testing"
+MOCK_RESPONSE = "This is a test response from the mock OpenAI service."
+
+# Connection pool shared by every OpenAIService
+OPENAI_HTTP_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=50, keepalive_expiry=60
+)
+# Multiplex concurrent streams over one connection when h2 is installed
+OPENAI_HTTP2 = importlib.util.find_spec("h2") is not None
+if not OPENAI_HTTP2:
+    logger.info("h2 is not installed; OpenAI requests will use HTTP/1.1")
+
+_shared_client: Optional[AsyncOpenAI] = None
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Return the process-wide OpenAI client, creating it on first use.
+
+    Creation never awaits, so concurrent callers on the event loop cannot
+    race to build two clients.
+
+    Raises:
+        RuntimeError: If no OpenAI API key is configured
+    """
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed():
+        api_key = get_settings().openai_api_key
+        if not api_key:
+            raise RuntimeError("OpenAI client not initialized: no API key configured")
+        _shared_client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=DefaultAsyncHttpxClient(
+                http2=OPENAI_HTTP2, limits=OPENAI_HTTP_LIMITS
+            ),
+        )
+    return _shared_client
+
+
+async def warm_openai_client() -> None:
+    """Open a connection to the OpenAI API ahead of the first chat request.
+
+    The TCP and TLS handshakes then stay in the shared pool, so the first
+    completion does not pay for them. Failures are only logged.
+    """
+    if _TESTING:
+        return
+
+    try:
+        await get_openai_client().with_options(timeout=10.0).models.list()
+    except Exception as e:
+        logger.warning("Could not pre-warm OpenAI connection: %s", e)
+
+
+async def close_openai_client() -> None:
+    """Close the shared OpenAI client if one was created."""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.close()
+        _shared_client = None
+
+
+def parse_delta_content(data: str) -> Optional[str]:
+    """Return the delta content of one streamed chat completion chunk.
+
+    Raises:
+        OpenAIServiceError: If the chunk reports an API error
+    """
+    chunk = orjson.loads(data)
+    if "error" in chunk:
+        raise OpenAIServiceError(chunk["error"].get("message", "Unknown error"))
+
+    choices = chunk.get("choices")
+    if not choices:
+        return None
+    content: Optional[str] = choices[0].get("delta", {}).get("content")
+    return content
+
+
+async def coalesce_deltas(
+    lines: AsyncIterator[str], chunk_size: int
+) -> AsyncIterator[str]:
+    """Yield the delta content of a chat completion event stream, coalesced.
+
+    Deltas are joined until ``chunk_size`` characters are buffered or
+    STREAM_FLUSH_INTERVAL has passed since the last flush. Buffered text is
+    flushed at that deadline even when no further line has arrived.
+
+    Raises:
+        OpenAIServiceError: If the stream reports an API error
+    """
+    buffer: List[str] = []
+    buffered = 0
+    last_flush = time.monotonic()
+    next_line: Optional[asyncio.Future[str]] = None
+
+    try:
+        while True:
+            pending: Awaitable[str]
+            if buffer:
+                # Wait for the next line only until the flush deadline
+                next_line = asyncio.ensure_future(anext(lines))
+                timeout = last_flush + STREAM_FLUSH_INTERVAL - time.monotonic()
+                await asyncio.wait((next_line,), timeout=max(0.0, timeout))
+                if not next_line.done():
+                    yield "".join(buffer)
+                    buffer.clear()
+                    buffered = 0
+                    last_flush = time.monotonic()
+                pending = next_line
+            else:
+                pending = anext(lines)
+
+            try:
+                line = await pending
+            except StopAsyncIteration:
+                break
+            next_line = None
+
+            if not line.startswith(SSE_DATA_PREFIX):
+                continue
+            data = line[len(SSE_DATA_PREFIX) :]
+            if data == SSE_DONE:
+                break
+
+            try:
+                content = parse_delta_content(data)
+            except OpenAIServiceError:
+                # Deliver what arrived before the error
+                if buffer:
+                    yield "".join(buffer)
+                raise
+            if not content:
+                continue
+            buffer.append(content)
+            buffered += len(content)
+
+            now = time.monotonic()
+            if buffered >= chunk_size or now - last_flush >= STREAM_FLUSH_INTERVAL:
+                yield "".join(buffer)
+                buffer.clear()
+                buffered = 0
+                last_flush = now
+
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        if next_line is not None:
+            next_line.cancel()
+
 
 class OpenAIService:
     """Service for interacting with OpenAI API."""
 
-    def __init__(self) -> None:
-        settings = get_settings()
-        self.model: str = settings.openai_model
-        self.chunk_size: int = settings.stream_chunk_size
-        self.client: Optional[AsyncOpenAI] = None
+    # Read once when the class is created; settings are fixed per process
+    model: str = get_settings().openai_model
+    chunk_size: int = get_settings().stream_chunk_size
 
-        # Initialize client only if not in test mode
-        if os.getenv("APP_ENV") != "testing":
-            self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+    @property
+    def client(self) -> AsyncOpenAI:
+        """Shared OpenAI client; only used outside test mode."""
+        return get_openai_client()
 
-    async def create_chat_completion_stream(
+    async def _openai_chat_completion_stream(
         self, messages: List[ChatCompletionMessageParam]
     ) -> AsyncIterator[str]:
         """Create a streaming chat completion."""
-        # Return mock response in test mode
-        if os.getenv("APP_ENV") == "testing":
-            yield "This is a test response from the mock OpenAI service."
-            return
-
-        # Check if client is initialized
-        if self.client is None:
-            logger.error("OpenAI client not initialized")
-            yield "Error: OpenAI client not initialized"
-            return
-
         try:
-            # When stream=True, create() returns AsyncStream[ChatCompletionChunk]
-            stream = await self.client.chat.completions.create(
+            client = self.client
+            # Read the raw event stream instead of letting the SDK build a
+            # ChatCompletionChunk model for every token
+            async with client.chat.completions.with_streaming_response.create(
                 model=self.model,
                 messages=messages,
                 stream=True,
                 temperature=0.7,
                 max_tokens=2000,
-            )
-
-            async for chunk in stream:
-                if chunk.choices[0].delta.content is not None:
-                    yield chunk.choices[0].delta.content
+            ) as response:
+                # Coalesce token-sized deltas so consumers wake up less often
+                async for content in coalesce_deltas(
+                    response.iter_lines(), self.chunk_size
+                ):
+                    yield content
 
         except Exception as e:
-            logger.error(f"OpenAI API error: {str(e)}")
-            yield f"Error: {str(e)}"
+            logger.error("OpenAI API error: %s", e)
+            yield f"Error: {e.__class__.__name__}: {e}"
 
-    async def create_chat_completion(
+    async def _openai_chat_completion(
         self, messages: List[ChatCompletionMessageParam]
     ) -> str:
         """Create a non-streaming chat completion."""
-        # Return mock response in test mode
-        if os.getenv("APP_ENV") == "testing":
-            return "This is a test response from the mock OpenAI service."
-
-        # Check if client is initialized
-        if self.client is None:
-            logger.error("OpenAI client not initialized")
-            raise ValueError("OpenAI client not initialized")
-
         try:
+            client = self.client
             # When stream=False (default), create() returns ChatCompletion
-            response = await self.client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model=self.model, messages=messages, temperature=0.7, max_tokens=2000
             )
 
             return response.choices[0].message.content or ""
 
         except Exception as e:
-            logger.error(f"OpenAI API error: {str(e)}")
+            logger.error("OpenAI API error: %s", e)
             raise
+
+    async def _mock_chat_completion_stream(
+        self, messages: List[ChatCompletionMessageParam]
+    ) -> AsyncIterator[str]:
+        """Stream the canned test response."""
+        yield MOCK_RESPONSE
+
+    async def _mock_chat_completion(
+        self, messages: List[ChatCompletionMessageParam]
+    ) -> str:
+        """Return the canned test response."""
+        return MOCK_RESPONSE
+
+    # Pick the implementations once instead of checking the mode on every call
+    if _TESTING:
+        create_chat_completion_stream = _mock_chat_completion_stream
+        create_chat_completion = _mock_chat_completion
+    else:
+        create_chat_completion_stream = _openai_chat_completion_stream
+        create_chat_completion = _openai_chat_completion
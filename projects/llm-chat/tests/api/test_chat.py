@@ -1,4 +1,5 @@
 import json
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
 
@@ -7,9 +8,12 @@ class TestChatAPI:
     def test_chat_endpoint_streaming(self, mock_chat_service, client):
         """Test chat endpoint with streaming response."""
         # Mock the chat service
-        mock_session = AsyncMock()
-        mock_session.session_id = "test-session-123"
-        mock_chat_service.get_or_create_session = AsyncMock(return_value=mock_session)
+        session = SimpleNamespace(session_id="test-session-123")
+
+        async def get_or_create_session(session_id=None):
+            return session
+
+        mock_chat_service.get_or_create_session = get_or_create_session
 
         # Mock streaming response
         async def mock_stream(session_id, message, file_ids=None):
@@ -75,21 +79,3 @@ class TestChatAPI:
 
         assert response.status_code == 400
         assert response.json()["detail"] == "No session found"
-
-    def test_health_check(self, client):
-        """Test health check endpoint."""
-        response = client.get("/health")
-
-        assert response.status_code == 200
-        assert response.json() == {
-            "status": "healthy",
-            "service": "LLM Chat Application",
-        }
-
-    def test_root_page(self, client):
-        """Test root page returns HTML."""
-        response = client.get("/")
-
-        assert response.status_code == 200
-        assert "text/html" in response.headers["content-type"]
-        assert "Chat with AI Assistant" in response.text
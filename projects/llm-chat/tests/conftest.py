@@ -21,9 +21,12 @@ def setup_test_environment():
     os.environ.pop("OPENAI_API_KEY", None)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
-    """Create test client with proper configuration."""
+    """Create test client with proper configuration.
+
+    Session-scoped so the app and its lifespan start once for the whole run.
+    """
     # Import after setting environment variables
     from src.main import app
 
@@ -31,6 +34,14 @@ def client():
         yield test_client
 
 
+@pytest.fixture(autouse=True)
+def clear_client_cookies(request):
+    """Keep cookies set by one test from leaking into the next."""
+    yield
+    if "client" in request.fixturenames:
+        request.getfixturevalue("client").cookies.clear()
+
+
 @pytest.fixture
 def mock_openai_response():
     """Mock OpenAI response for testing."""
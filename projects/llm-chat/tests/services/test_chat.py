@@ -1,4 +1,6 @@
-from unittest.mock import AsyncMock, patch
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import pytest
 
@@ -7,6 +9,14 @@ from src.models.chat import ChatSession
 from src.services.chat import ChatService
 
 
+class FakeOpenAIService:
+    """Plain async stub; cheaper to build than an AsyncMock."""
+
+    async def create_chat_completion_stream(self, messages):
+        yield "Hello"
+        yield " world!"
+
+
 @pytest.mark.asyncio
 class TestChatService:
 
@@ -36,18 +46,42 @@ class TestChatService:
         assert session1 is session2
 
     @patch("src.services.chat.OpenAIService")
-    async def test_process_message_stream(self, mock_openai_class):
-        """Test processing a message with streaming."""
-        # Mock OpenAI service
-        mock_openai = AsyncMock()
-        mock_openai_class.return_value = mock_openai
+    async def test_get_or_create_session_evicts_least_recently_used(self, mock_openai):
+        """Test that the oldest session is evicted once max_sessions is reached."""
+        service = ChatService()
+        service.settings = service.settings.model_copy(update={"max_sessions": 2})
+
+        await service.get_or_create_session("first")
+        await service.get_or_create_session("second")
+        # Touch "first" so "second" becomes the least recently used
+        await service.get_or_create_session("first")
+        await service.get_or_create_session("third")
+
+        assert list(service.sessions) == ["first", "third"]
+        assert list(service._last_accessed) == ["first", "third"]
+
+    @patch("src.services.chat.OpenAIService")
+    async def test_expire_sessions_skips_recently_accessed(self, mock_openai):
+        """Test that only sessions idle past the timeout are expired."""
+        service = ChatService()
+        timeout = service.settings.session_timeout_minutes * 60
+
+        await service.get_or_create_session("idle")
+        active = await service.get_or_create_session("active")
+        start = service._last_accessed["idle"]
+
+        # "active" is used again later, leaving a superseded heap entry
+        service._touch("active", start + timeout / 2)
 
-        async def mock_stream(messages):
-            yield "Hello"
-            yield " world!"
+        service._expire_sessions(start + timeout + 1)
 
-        mock_openai.create_chat_completion_stream = mock_stream
+        assert "idle" not in service.sessions
+        assert service.sessions["active"] is active
+        assert service._expiry_heap[0][1] == "active"
 
+    async def test_process_message_stream(self, monkeypatch):
+        """Test processing a message with streaming."""
+        monkeypatch.setattr("src.services.chat.OpenAIService", FakeOpenAIService)
         service = ChatService()
 
         # Process message
@@ -65,6 +99,26 @@ class TestChatService:
         assert session.messages[1].content == "Hello world!"
         assert session.messages[1].role == "assistant"
 
+    async def test_expire_sessions_after_message(self, monkeypatch):
+        """Test that a message reply restarts the session's idle timeout."""
+        monkeypatch.setattr("src.services.chat.OpenAIService", FakeOpenAIService)
+        now = [time.monotonic()]
+        monkeypatch.setattr(
+            "src.services.chat.time", SimpleNamespace(monotonic=lambda: now[0])
+        )
+        service = ChatService()
+        timeout = service.settings.session_timeout_minutes * 60
+
+        # The reply streams for a full timeout after the session is opened
+        async for _ in service.process_message_stream("slow-reply", "Hi there"):
+            now[0] += timeout / 2
+
+        service._expire_sessions(now[0] + 1)
+        assert "slow-reply" in service.sessions
+
+        service._expire_sessions(now[0] + timeout + 1)
+        assert "slow-reply" not in service.sessions
+
     @patch("src.services.chat.OpenAIService")
     async def test_clear_session(self, mock_openai):
         """Test clearing a session."""
@@ -0,0 +1,115 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.core.exceptions import ExternalServiceError
+from src.services.file_manager_client import FileManagerClient
+
+
+@pytest.mark.asyncio
+class TestFileManagerClient:
+
+    async def test_get_multiple_files_content_skips_failures(self, monkeypatch):
+        """Test that failed files are dropped and order is preserved."""
+
+        async def fake_get_file_content(file_id):
+            if file_id == "missing":
+                raise ExternalServiceError(f"File {file_id} not found")
+            return f"content of {file_id}"
+
+        client = FileManagerClient()
+        monkeypatch.setattr(client, "get_file_content", fake_get_file_content)
+
+        contents = await client.get_multiple_files_content(["a", "missing", "b"])
+
+        assert contents == {"a": "content of a", "b": "content of b"}
+        assert list(contents) == ["a", "b"]
+
+    async def test_get_multiple_files_content_is_concurrent(self, monkeypatch):
+        """Test that files are fetched concurrently up to the limit."""
+        in_flight = 0
+        peak = 0
+
+        async def fake_get_file_content(file_id):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return file_id
+
+        client = FileManagerClient()
+        monkeypatch.setattr(client, "get_file_content", fake_get_file_content)
+        monkeypatch.setattr(
+            "src.services.file_manager_client.MAX_CONCURRENT_FETCHES", 3
+        )
+
+        contents = await client.get_multiple_files_content(
+            [f"file-{i}" for i in range(10)]
+        )
+
+        assert len(contents) == 10
+        assert peak == 3
+
+    async def test_http_client_is_shared_until_closed(self):
+        """Test that requests reuse one HTTP client until it is closed."""
+        client = FileManagerClient()
+
+        http_client = client._get_client()
+        assert client._get_client() is http_client
+
+        await client.aclose()
+        assert http_client.is_closed
+        assert client._get_client() is not http_client
+        await client.aclose()
+
+    async def test_get_file_content_is_cached(self, monkeypatch):
+        """Test that file contents are reused until the cache entry expires."""
+        requests = []
+
+        def handler(request):
+            requests.append(request.url.path)
+            return httpx.Response(200, text="cached content")
+
+        client = FileManagerClient()
+        client._client = httpx.AsyncClient(
+            base_url=client.base_url, transport=httpx.MockTransport(handler)
+        )
+
+        assert await client.get_file_content("abc") == "cached content"
+        assert await client.get_file_content("abc") == "cached content"
+        assert requests == ["/api/files/abc"]
+
+        # Expired entries are fetched again
+        monkeypatch.setattr(
+            "src.services.file_manager_client.FILE_CONTENT_CACHE_TTL", 0
+        )
+        await client.get_file_content("abc")
+        assert len(requests) == 2
+
+        await client.aclose()
+
+    async def test_get_file_content_revalidates_with_etag(self, monkeypatch):
+        """Test that expired entries are revalidated with If-None-Match."""
+        conditional = []
+
+        def handler(request):
+            conditional.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304, headers={"ETag": '"v1"'})
+            return httpx.Response(200, text="content", headers={"ETag": '"v1"'})
+
+        client = FileManagerClient()
+        client._client = httpx.AsyncClient(
+            base_url=client.base_url, transport=httpx.MockTransport(handler)
+        )
+        monkeypatch.setattr(
+            "src.services.file_manager_client.FILE_CONTENT_CACHE_TTL", 0
+        )
+
+        assert await client.get_file_content("abc") == "content"
+        assert await client.get_file_content("abc") == "content"
+        assert conditional == [None, '"v1"']
+
+        await client.aclose()
@@ -0,0 +1,164 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+from src.core.exceptions import OpenAIServiceError
+from src.services.openai_client import (
+    OpenAIService,
+    close_openai_client,
+    get_openai_client,
+    parse_delta_content,
+)
+
+
+def sse_delta(content):
+    """Format one streamed chunk carrying ``content`` as an SSE data line."""
+    chunk = {"choices": [{"delta": {"content": content}}]}
+    return f"data: {orjson.dumps(chunk).decode()}"
+
+
+def fake_openai_client(lines):
+    """Build a client whose streaming create() replays ``lines``.
+
+    An asyncio.Event in ``lines`` holds the stream until it is set.
+    """
+
+    async def iter_lines():
+        for line in lines:
+            if isinstance(line, asyncio.Event):
+                await line.wait()
+            else:
+                yield line
+
+    @asynccontextmanager
+    async def create(**kwargs):
+        yield SimpleNamespace(iter_lines=iter_lines)
+
+    streaming = SimpleNamespace(create=create)
+    return SimpleNamespace(
+        chat=SimpleNamespace(
+            completions=SimpleNamespace(with_streaming_response=streaming)
+        )
+    )
+
+
+class TestParseDeltaContent:
+
+    @pytest.mark.parametrize(
+        "chunk,expected",
+        [
+            ({"choices": [{"delta": {"content": "Hello"}}]}, "Hello"),
+            ({"choices": [{"delta": {"role": "assistant"}}]}, None),
+            ({"choices": [], "usage": {"total_tokens": 3}}, None),
+        ],
+    )
+    def test_parse_delta_content(self, chunk, expected):
+        """Test extracting delta content from streamed chunks."""
+        assert parse_delta_content(orjson.dumps(chunk).decode()) == expected
+
+    def test_parse_delta_content_error(self):
+        """Test that error chunks raise OpenAIServiceError."""
+        data = orjson.dumps({"error": {"message": "Rate limited"}}).decode()
+
+        with pytest.raises(OpenAIServiceError, match="Rate limited"):
+            parse_delta_content(data)
+
+
+@pytest.mark.asyncio
+class TestSharedOpenAIClient:
+
+    async def test_client_is_shared_until_closed(self):
+        """Test that one OpenAI client is reused until it is closed."""
+        client = get_openai_client()
+        assert get_openai_client() is client
+
+        await close_openai_client()
+        assert client.is_closed()
+        assert get_openai_client() is not client
+        await close_openai_client()
+
+
+@pytest.mark.asyncio
+class TestChatCompletionStream:
+    """Tests for the real stream loop, which test mode otherwise replaces."""
+
+    MESSAGES = [{"role": "user", "content": "Hello"}]
+
+    async def collect(self, service):
+        return [
+            chunk
+            async for chunk in service._openai_chat_completion_stream(self.MESSAGES)
+        ]
+
+    def make_service(self, monkeypatch, lines, chunk_size=1000):
+        monkeypatch.setattr(
+            "src.services.openai_client.get_openai_client",
+            lambda: fake_openai_client(lines),
+        )
+        service = OpenAIService()
+        service.chunk_size = chunk_size
+        return service
+
+    async def test_stream_stops_at_done(self, monkeypatch):
+        """Test that non-data lines are skipped and [DONE] ends the stream."""
+        lines = [": keep-alive", "", sse_delta("Hel"), sse_delta("lo"), "data: [DONE]"]
+        service = self.make_service(monkeypatch, [*lines, sse_delta("ignored")])
+
+        assert "".join(await self.collect(service)) == "Hello"
+
+    async def test_stream_coalesces_deltas(self, monkeypatch):
+        """Test that deltas are joined up to chunk_size and the rest is flushed."""
+        monkeypatch.setattr("src.services.openai_client.STREAM_FLUSH_INTERVAL", 60.0)
+        lines = [sse_delta("ab"), sse_delta("cd"), sse_delta("ef")]
+        service = self.make_service(monkeypatch, lines, chunk_size=4)
+
+        assert await self.collect(service) == ["abcd", "ef"]
+
+    async def test_stream_flushes_buffered_delta_while_waiting(self, monkeypatch):
+        """Test that a buffered delta is sent without waiting for the next one."""
+        resume = asyncio.Event()
+        lines = [sse_delta("Hi"), resume, sse_delta(" there")]
+        service = self.make_service(monkeypatch, lines)
+        stream = service._openai_chat_completion_stream(self.MESSAGES)
+
+        assert await asyncio.wait_for(anext(stream), timeout=1.0) == "Hi"
+        resume.set()
+        assert [chunk async for chunk in stream] == [" there"]
+
+    async def test_stream_error_chunk(self, monkeypatch):
+        """Test that text before an error chunk is sent, then the error."""
+        error = orjson.dumps({"error": {"message": "Rate limited"}}).decode()
+        lines = [sse_delta("partial"), f"data: {error}", sse_delta("ignored")]
+        service = self.make_service(monkeypatch, lines)
+
+        assert await self.collect(service) == [
+            "partial",
+            "Error: OpenAIServiceError: Rate limited",
+        ]
+
+
+class TestStreamOverhead:
+    """Benchmarks guarding the per-chunk streaming overhead."""
+
+    def test_parse_delta_content_overhead(self, benchmark):
+        """Benchmark decoding one streamed chunk."""
+        data = orjson.dumps({"choices": [{"delta": {"content": "token"}}]}).decode()
+
+        assert benchmark(parse_delta_content, data) == "token"
+
+    def test_stream_overhead(self, benchmark):
+        """Benchmark draining a completion stream in test mode."""
+        service = OpenAIService()
+        messages = [{"role": "user", "content": "Hello"}]
+
+        async def run():
+            return [
+                chunk async for chunk in service.create_chat_completion_stream(messages)
+            ]
+
+        # pytest-benchmark has no async support, so drive each round with asyncio.run
+        chunks = benchmark(lambda: asyncio.run(run()))
+        assert chunks
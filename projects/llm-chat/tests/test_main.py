@@ -14,3 +14,4 @@ def test_root_endpoint(client):
     response = client.get("/")
     assert response.status_code == 200
     assert "text/html" in response.headers["content-type"]
+    assert "Chat with AI Assistant" in response.text
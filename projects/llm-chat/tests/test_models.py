@@ -42,22 +42,16 @@ class TestChatModels:
 
     def test_chat_session_max_history(self):
         """Test that chat session maintains max history length."""
-        from unittest.mock import patch
+        session = ChatSession(session_id="test-session", max_history_length=3)
 
-        session = ChatSession(session_id="test-session")
-
-        # Mock settings to have max_history_length of 3
-        with patch("src.core.config.get_settings") as mock_settings:
-            mock_settings.return_value.max_history_length = 3
+        # Add 5 messages
+        for i in range(5):
+            session.add_message("user", f"Message {i}")
 
-            # Add 5 messages
-            for i in range(5):
-                session.add_message("user", f"Message {i}")
-
-            # Should only have last 3 messages
-            assert len(session.messages) == 3
-            assert session.messages[0].content == "Message 2"
-            assert session.messages[2].content == "Message 4"
+        # Should only have last 3 messages
+        assert len(session.messages) == 3
+        assert session.messages[0].content == "Message 2"
+        assert session.messages[2].content == "Message 4"
 
     def test_get_openai_messages(self):
         """Test converting messages to OpenAI format."""
@@ -70,3 +64,15 @@ class TestChatModels:
         assert len(openai_messages) == 2
         assert openai_messages[0] == {"role": "user", "content": "Hello"}
         assert openai_messages[1] == {"role": "assistant", "content": "Hi!"}
+
+    def test_get_openai_messages_follows_history_limit(self):
+        """Test that the OpenAI view drops old messages with the history."""
+        session = ChatSession(session_id="test-session", max_history_length=2)
+        for i in range(3):
+            session.add_message("user", f"Message {i}")
+
+        openai_messages = session.get_openai_messages()
+        openai_messages[-1] = {"role": "user", "content": "replaced"}
+
+        assert [m["content"] for m in openai_messages] == ["Message 1", "replaced"]
+        assert session.get_openai_messages()[-1]["content"] == "Message 2"